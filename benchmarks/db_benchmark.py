@@ -0,0 +1,253 @@
+"""
+Scaling benchmark of `DatabaseManager`, entirely offline on synthetic data.
+
+For every database size it fills a fresh database with synthetic jobs &
+employers, then times writes, duplicate checks and searches against it in
+their per-row, batched, group-committed, cached, full-text and `LIKE` modes.
+Per-row commits are also timed with SQLite's default pragmas, the rollback
+journal & `synchronous=FULL` the scraper used before WAL mode, as a baseline:
+
+    python -m benchmarks.db_benchmark --sizes 10000 100000 1000000 -o db-benchmark.json
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import sqlite3
+import argparse
+import platform
+import tempfile
+from typing import Callable, Dict, List, Sequence
+from scraper.database_manager import CONNECTION_PRAGMAS, DatabaseManager
+from benchmarks.synthetic_data import company_names, generate_employers, generate_jobs, unknown_jobids
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+# Rows per transaction while filling a database up to its size
+LOAD_BATCH_SIZE = 10_000
+
+# Jobs on a results page, the batch the scraper writes & checks at once
+PAGE_SIZE = 25
+
+# Calls per commit of the database writer's default group commit
+GROUP_COMMIT_SIZE = 100
+
+SEARCH_TERMS = ["Python", "Data Engineer", "Senior", "Remote", "Kubernetes", '"Site Reliability"', "Eng*", "Miami"]
+
+# SQLite's defaults, the pragmas every connection had before WAL mode
+DEFAULT_PRAGMAS = (
+    'PRAGMA journal_mode=DELETE',
+    'PRAGMA synchronous=FULL',
+    'PRAGMA cache_size=-2000',
+    'PRAGMA temp_store=DEFAULT',
+)
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def summarize(operation: str, mode: str, size: int, latencies: List[float], rows_per_call: float = 1) -> Dict:
+    """
+    Returns the throughput & latency percentiles of `latencies`, the seconds every call took
+    """
+    total = sum(latencies)
+    ordered = sorted(latencies)
+
+    return {
+        "rows": size,
+        "operation": operation,
+        "mode": mode,
+        "calls": len(latencies),
+        "rows_per_call": rows_per_call,
+        "seconds": round(total, 6),
+        "rows_per_second": round(len(latencies) * rows_per_call / total, 1) if total else None,
+        "latency_ms": {
+            "mean": round(total / len(latencies) * 1000, 4),
+            "p50": round(percentile(ordered, 0.50) * 1000, 4),
+            "p95": round(percentile(ordered, 0.95) * 1000, 4),
+            "p99": round(percentile(ordered, 0.99) * 1000, 4),
+            "max": round(ordered[-1] * 1000, 4),
+        },
+    }
+
+
+def time_calls(call: Callable, args_list: Sequence[tuple]) -> List[float]:
+    """
+    Returns the seconds each call of `call` with every entry of `args_list` took
+    """
+    latencies = []
+
+    for args in args_list:
+        start = time.perf_counter()
+        call(*args)
+        latencies.append(time.perf_counter() - start)
+
+    return latencies
+
+
+def pages(rows: List, page_size: int = PAGE_SIZE) -> List[tuple]:
+    return [(rows[i:i + page_size],) for i in range(0, len(rows), page_size)]
+
+
+def apply_pragmas(database: DatabaseManager, pragmas: Sequence[str]) -> None:
+    # The journal mode can only change outside of a transaction
+    database.commit()
+    for pragma in pragmas:
+        database.cursor.execute(pragma)
+
+
+def like_term(search_term: str) -> str:
+    """
+    Returns `search_term` without its FTS syntax, the quotes of phrases & the
+    `*` of prefixes, so the `LIKE` scans look for the same text as the full-text searches
+    """
+    return search_term.replace('"', '').rstrip('*')
+
+
+def fill_database(database: DatabaseManager, size: int, seed: int) -> Dict:
+    """
+    Fills the database with `size` synthetic jobs and their employers, in large batches
+    """
+    companies = company_names(max(1, size // 20), seed)
+    latencies = time_calls(database.add_employers_many, pages(list(generate_employers(companies, seed)),
+                                                              LOAD_BATCH_SIZE))
+
+    for start in range(0, size, LOAD_BATCH_SIZE):
+        jobs = list(generate_jobs(min(LOAD_BATCH_SIZE, size - start), seed, start, companies))
+        latencies += time_calls(database.add_jobs_many, [(jobs,)])
+
+    return summarize("fill", "batch", size, latencies, round((size + len(companies)) / len(latencies), 1))
+
+
+def run_size(size: int, samples: int, search_samples: int, seed: int,
+             directory: str, logger: logging.Logger) -> List[Dict]:
+    """
+    Benchmarks every operation against a fresh database of `size` jobs
+    """
+    os.environ['DATABASE_PATH'] = os.path.join(directory, f"jobs-{size}.db")
+    database = DatabaseManager(logger)
+    results = []
+
+    try:
+        results.append(fill_database(database, size, seed))
+        print(f"Filled {size} rows in {results[-1]['seconds']}s", file=sys.stderr)
+
+        # New rows are generated past the filled ones, so every timed insert is a real one
+        next_row = size
+        companies = company_names(max(1, size // 20), seed)
+
+        def new_jobs(count: int) -> List[tuple]:
+            nonlocal next_row
+            jobs = list(generate_jobs(count, seed, next_row, companies))
+            next_row += count
+            return jobs
+
+        # Writes
+        results.append(summarize("add_job", "commit_per_row", size,
+                                 time_calls(database.add_job, new_jobs(samples))))
+
+        apply_pragmas(database, DEFAULT_PRAGMAS)
+        results.append(summarize("add_job", "commit_per_row_default_pragmas", size,
+                                 time_calls(database.add_job, new_jobs(samples))))
+        apply_pragmas(database, CONNECTION_PRAGMAS)
+
+        database.defer_commits = True
+        jobs = new_jobs(samples)
+        latencies = []
+        for i in range(0, len(jobs), GROUP_COMMIT_SIZE):
+            latencies += time_calls(database.add_job, jobs[i:i + GROUP_COMMIT_SIZE])
+            latencies[-1] += sum(time_calls(database.commit, [()]))
+        database.defer_commits = False
+        results.append(summarize("add_job", "group_commit", size, latencies))
+
+        results.append(summarize("add_jobs_many", "batch", size,
+                                 time_calls(database.add_jobs_many, pages(new_jobs(samples))), PAGE_SIZE))
+
+        employers = [(f"Benchmark Employer {size}-{i}", "Florida") for i in range(samples * 2)]
+        results.append(summarize("add_employer", "commit_per_row", size,
+                                 time_calls(database.add_employer, employers[:samples])))
+        results.append(summarize("add_employers_many", "batch", size,
+                                 time_calls(database.add_employers_many, pages(employers[samples:])), PAGE_SIZE))
+
+        # Duplicate checks, half of them on stored jobs & half on unknown ones
+        known = [job[0] for job in generate_jobs(samples // 2, seed, 0, companies)]
+        jobids = known + unknown_jobids(samples - len(known), next_row)
+
+        results.append(summarize("is_a_new_job", "per_row", size,
+                                 time_calls(database.is_a_new_job, [(jobid,) for jobid in jobids])))
+        results.append(summarize("filter_new_jobs", "batch", size,
+                                 time_calls(database.filter_new_jobs, pages(jobids)), PAGE_SIZE))
+
+        database.load_known_jobids()
+        results.append(summarize("filter_new_jobs", "cached", size,
+                                 time_calls(database.filter_new_jobs, pages(jobids)), PAGE_SIZE))
+        database.known_jobids = None
+
+        # Searches, ranked full-text matches & the `LIKE` scan fallback
+        terms = [(SEARCH_TERMS[i % len(SEARCH_TERMS)],) for i in range(search_samples)]
+
+        if database.has_fts:
+            results.append(summarize("search_jobs", "fts", size, time_calls(database.search_jobs, terms)))
+
+        has_fts, database.has_fts = database.has_fts, False
+        results.append(summarize("search_jobs", "like", size,
+                                 time_calls(database.search_jobs, [(like_term(term),) for term, in terms])))
+        database.has_fts = has_fts
+    finally:
+        database.close()
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DatabaseManager at growing database sizes")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Jobs in the database for each run (default 10000 100000 1000000)")
+    parser.add_argument("--samples", type=int, default=1000,
+                        help="Rows written & checked per operation and mode (default 1000)")
+    parser.add_argument("--search_samples", type=int, default=50,
+                        help="Searches per mode, the LIKE scans get slow on large databases (default 50)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic data")
+    parser.add_argument("--dir", help="Directory for the databases, a temporary one removed afterwards by default")
+    parser.add_argument("-o", "--output", help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    # The benchmark measures SQLite, not the console
+    logger = logging.getLogger("db_benchmark")
+    logger.addHandler(logging.NullHandler())
+    logger.setLevel(logging.WARNING)
+    logger.propagate = False
+
+    directory = args.dir or tempfile.mkdtemp(prefix="db-benchmark-")
+    os.makedirs(directory, exist_ok=True)
+
+    report = {
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "seed": args.seed,
+        "samples": args.samples,
+        "search_samples": args.search_samples,
+        "results": [],
+    }
+
+    try:
+        for size in args.sizes:
+            report["results"] += run_size(size, max(2, args.samples), max(1, args.search_samples),
+                                          args.seed, directory, logger)
+    finally:
+        if not args.dir:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    json.dump(report, sys.stdout, indent=2)
+    print()
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+End-to-end throughput benchmark of `JobScraper.run` against a recorded session.
+
+Record a session once with `python -m scraper.main -s ... -l ... --record DIR`,
+then replay it offline, without waits, into a fresh database:
+
+    python -m benchmarks.replay_benchmark -s "Software Engineer" -l "Miami, FL" --replay DIR
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import tempfile
+from typing import Dict
+from dotenv import load_dotenv
+from scraper.main import add_scrape_arguments, resolve_scrape_args
+from scraper.log_setup import setup_logging
+from scraper.job_scraper import JobScraper
+
+
+async def run_benchmark(args, logger: logging.Logger) -> Dict[str, float]:
+    """
+    Runs the scraper over the replayed session and returns its throughput
+    """
+    scraper = JobScraper(args, logger)
+
+    start = time.perf_counter()
+    await scraper.run()
+    elapsed = time.perf_counter() - start
+
+    pages = scraper.stats["pages"]
+    cards = scraper.stats["cards"]
+    db_writes = scraper.database.database_manager.rows_written
+
+    return {
+        "searches": len(args.searches),
+        "seconds": round(elapsed, 3),
+        "pages": pages,
+        "cards": cards,
+        "db_writes": db_writes,
+        "pages_per_second": round(pages / elapsed, 3),
+        "cards_per_second": round(cards / elapsed, 3),
+        "db_writes_per_second": round(db_writes / elapsed, 3),
+    }
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Replay benchmark of the job scraper")
+    add_scrape_arguments(parser)
+    parser.add_argument("-o", "--output", help="Also write the JSON report to this file")
+    args = resolve_scrape_args(parser.parse_args(), parser)
+
+    if not args.replay:
+        parser.error("--replay is required, the benchmark never hits the live site")
+
+    # Every run starts from an empty database so all replayed jobs are written
+    os.environ['DATABASE_PATH'] = os.path.join(tempfile.mkdtemp(prefix="replay-benchmark-"), "jobs.db")
+
+    logger = setup_logging(os.getenv('LOGGING_PATH'), args.log_level, args.json_log)
+    logger.setLevel(logging.WARNING)
+
+    report = asyncio.run(run_benchmark(args, logger))
+    json.dump(report, sys.stdout, indent=2)
+    print()
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
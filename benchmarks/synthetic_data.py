@@ -0,0 +1,95 @@
+"""
+Deterministic generator of realistic `jobs` & `employers` rows, to fill
+benchmark databases without scraping anything.
+"""
+import os
+import random
+from typing import Iterator, List, Tuple
+
+
+LEVELS = ["", "Junior", "Senior", "Sr.", "Staff", "Principal", "Lead", "Associate"]
+ROLES = [
+    "Software Engineer", "Backend Developer", "Frontend Engineer", "Full Stack Developer",
+    "Data Engineer", "Data Scientist", "DevOps Engineer", "Site Reliability Engineer",
+    "Machine Learning Engineer", "QA Automation Engineer", "Mobile Developer", "Security Engineer",
+    "Cloud Architect", "Platform Engineer", "Embedded Software Engineer", "Product Engineer",
+]
+STACKS = ["", "Python", "Java", "Go", "TypeScript", "React", "AWS", "Kubernetes", "C++", "Rust", "Node.js"]
+
+COMPANY_PREFIXES = ["Blue", "Bright", "Cloud", "Data", "Green", "Hyper", "Iron", "Meta", "North",
+                    "Open", "Quantum", "Red", "Silver", "Smart", "Swift", "True", "Vertex", "Zen"]
+COMPANY_SUFFIXES = ["Labs", "Systems", "Works", "Analytics", "Health", "Soft", "Logic", "Bank",
+                    "Networks", "Dynamics", "Robotics", "Media", "Capital", "Foods", "Energy"]
+COMPANY_FORMS = ["", " Inc.", " LLC", " Corp", " Group", " Technologies"]
+
+CITIES = [
+    ("Miami", "FL"), ("Orlando", "FL"), ("Tampa", "FL"), ("Austin", "TX"), ("Dallas", "TX"),
+    ("New York", "NY"), ("Seattle", "WA"), ("San Francisco", "CA"), ("Los Angeles", "CA"),
+    ("Chicago", "IL"), ("Boston", "MA"), ("Denver", "CO"), ("Atlanta", "GA"), ("Raleigh", "NC"),
+]
+STATES = ["Florida", "Texas", "New York", "Washington", "California", "Illinois", "Massachusetts"]
+
+# Most cards don't state a workplace type
+REMOTE_STATUSES = ["", "", "Remote", "Hybrid", "On-site"]
+
+JOBS_PAGE_BASE_URL = os.getenv("JOBS_PAGE_BASE_URL", "https://www.linkedin.com/jobs/view/")
+
+# LinkedIn job ids are 10 digit numbers
+FIRST_JOBID = 3_500_000_000
+
+
+def company_names(count: int, seed: int = 0) -> List[str]:
+    """
+    Returns `count` distinct company names
+    """
+    rng = random.Random(seed)
+    names = [f"{prefix}{suffix}{form}" for prefix in COMPANY_PREFIXES
+             for suffix in COMPANY_SUFFIXES for form in COMPANY_FORMS]
+    rng.shuffle(names)
+
+    # Past the combinations, further names are numbered like real holding companies
+    return [names[i % len(names)] + (f" {i // len(names) + 1}" if i >= len(names) else "")
+            for i in range(count)]
+
+
+def job_title(rng: random.Random) -> str:
+    parts = [rng.choice(LEVELS), rng.choice(ROLES)]
+    stack = rng.choice(STACKS)
+    title = " ".join(part for part in parts if part)
+
+    return f"{title} ({stack})" if stack else title
+
+
+def generate_jobs(count: int, seed: int = 0, start: int = 0,
+                  companies: List[str] = None) -> Iterator[Tuple[str, str, str, str, str, str]]:
+    """
+    Yields `count` jobs as `(jobid, title, company, location, remote_status,
+    linkedin_url)` tuples, the rows `DatabaseManager.add_jobs_many` takes.
+    Job ids are unique across calls with non-overlapping `start` ranges
+    """
+    rng = random.Random(seed * 1_000_003 + start)
+    companies = companies or company_names(max(1, count // 20), seed)
+
+    for i in range(start, start + count):
+        jobid = str(FIRST_JOBID + i)
+        city, state = rng.choice(CITIES)
+
+        yield (jobid, job_title(rng), rng.choice(companies), f"{city}, {state}",
+               rng.choice(REMOTE_STATUSES), f"{JOBS_PAGE_BASE_URL}{jobid}")
+
+
+def generate_employers(companies: List[str], seed: int = 0) -> Iterator[Tuple[str, str]]:
+    """
+    Yields a `(company, state)` employer, the rows `DatabaseManager.add_employers_many` takes, per company
+    """
+    rng = random.Random(seed)
+
+    for company in companies:
+        yield company, rng.choice(STATES)
+
+
+def unknown_jobids(count: int, start: int) -> List[str]:
+    """
+    Returns `count` job ids that `generate_jobs` only yields past `start`
+    """
+    return [str(FIRST_JOBID + start + i) for i in range(count)]
@@ -8,5 +8,8 @@ LOCATORS = {
     "company": ".artdeco-entity-lockup__subtitle span",
     "pagination_list": ".artdeco-pagination__pages",
     "pagination_button": lambda page_num: f'button[aria-label="Page {page_num}"]',
-    "more_pagination_buttons": lambda page_num: f'button[aria-label="Page {page_num}"]'
+    "more_pagination_buttons": lambda page_num: f'button[aria-label="Page {page_num}"]',
+    "job_description": "#job-details",
+    "job_insights": ".job-details-jobs-unified-top-card__job-insight",
+    "job_top_card_description": ".job-details-jobs-unified-top-card__primary-description-container"
 }
\ No newline at end of file
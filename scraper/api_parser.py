@@ -0,0 +1,214 @@
+import re
+import sys
+import json
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Set, Union
+from .page_handler import parse_location
+
+# Only needed for annotations, so saved responses can be parsed without Playwright installed
+if TYPE_CHECKING:
+    from playwright.async_api import Page, Response
+
+
+# Marks the URLs of the background requests returning the search results cards
+JOB_CARDS_URL_PATTERN = "voyagerJobsDashJobCards"
+
+# The job id is the number in urns like `urn:li:fsd_jobPosting:4012345678`
+# or `urn:li:fsd_jobPostingCard:(4012345678,JOBS_SEARCH)`
+JOBID_PATTERN = re.compile(r"jobPosting(?:Card)?:\(?(\d+)")
+
+# Keys of a job card holding the urn of its job posting, most reliable first
+JOB_URN_KEYS = ("jobPostingUrn", "*jobPosting", "preDashNormalizedJobPostingUrn", "entityUrn")
+
+# The offset of the first card of a response, either a `&start=25` URL
+# parameter or a `start:25` field of the Rest.li `query=(...)` parameter
+START_PATTERN = re.compile(r"[?&(,]start[=:](\d+)")
+
+
+def is_job_cards_response(url: str) -> bool:
+    return JOB_CARDS_URL_PATTERN in url
+
+
+def get_start(url: str) -> int:
+    """
+    Returns the offset of the first card of the job cards response at `url`
+    """
+    match = START_PATTERN.search(url)
+    return int(match.group(1)) if match else 0
+
+
+def get_text(value: Any) -> str:
+    """
+    Returns the text of a voyager text field, either a string or a `{"text": ...}` view model
+    """
+    if isinstance(value, dict):
+        value = value.get("text")
+
+    return value.strip() if isinstance(value, str) else ''
+
+
+def get_jobid(card: Dict[str, Any]) -> Union[str, None]:
+    """
+    Returns the job id of a job card, read from the first of its urns that has one
+    """
+    for key in JOB_URN_KEYS:
+        value = card.get(key)
+
+        if isinstance(value, str):
+            match = JOBID_PATTERN.search(value)
+            if match:
+                return match.group(1)
+
+    return None
+
+
+def is_job_card(entity: Dict[str, Any]) -> bool:
+    return entity.get("$type", "").endswith("JobPostingCard") or (
+        "jobPostingTitle" in entity and "primaryDescription" in entity
+    )
+
+
+def iter_job_cards(payload: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Yields every job card entity in a voyager payload. Cards are either
+    nested in the response's `data` or listed flat in its `included`
+    entities, depending on the API version, so the whole payload is walked
+    """
+    stack = [payload]
+
+    while stack:
+        value = stack.pop()
+
+        if isinstance(value, dict):
+            if is_job_card(value):
+                yield value
+            stack.extend(reversed(list(value.values())))
+        elif isinstance(value, list):
+            stack.extend(reversed(value))
+
+
+def parse_job_cards(payload: Any) -> List[Dict[str, str]]:
+    """
+    Returns a record for every job card in a search results API payload, in
+    the same format as `PageHandler.extract_job_cards`. Cards without a job
+    id, and repeats of the same job, are skipped
+    """
+    records = []
+    seen_jobids: Set[str] = set()
+
+    for card in iter_job_cards(payload):
+        jobid = get_jobid(card)
+        if not jobid or jobid in seen_jobids:
+            continue
+
+        seen_jobids.add(jobid)
+        location, remote_status = parse_location(get_text(card.get("secondaryDescription")))
+
+        records.append({
+            "jobid": jobid,
+            "title": get_text(card.get("jobPostingTitle")) or get_text(card.get("title")),
+            "company": get_text(card.get("primaryDescription")),
+            "location": location,
+            "remote_status": remote_status,
+        })
+
+    return records
+
+
+class ApiJobCards:
+    """
+    Collects the job cards of the search results API responses a page
+    receives, so a results page can be read without touching its DOM. Cards
+    are grouped by the results page their response's offset falls on, so a
+    response arriving late for one page never ends up in the next one
+    """
+
+    logger: logging.Logger
+    page_size: int
+    page: 'Page'
+    pages: Dict[int, Dict[str, Dict[str, str]]]
+    pending: Set[asyncio.Task]
+    responses: int
+
+    def __init__(self, logger: logging.Logger, page_size: int):
+        self.logger = logger
+        self.page_size = page_size
+        self.page = None
+        self.pages = {}
+        self.pending = set()
+        self.responses = 0
+
+
+    def attach(self, page: 'Page') -> None:
+        """
+        Starts collecting the cards received by `page`, instead of the previous page if any
+        """
+        self.detach()
+        self.page = page
+        page.on("response", self.handle_response)
+
+
+    def detach(self) -> None:
+        if self.page:
+            self.page.remove_listener("response", self.handle_response)
+            self.page = None
+
+
+    def handle_response(self, response: 'Response') -> None:
+        if response.ok and is_job_cards_response(response.url):
+            task = asyncio.ensure_future(self.read_response(response))
+            self.pending.add(task)
+            task.add_done_callback(self.pending.discard)
+
+
+    async def read_response(self, response: 'Response') -> None:
+        try:
+            records = parse_job_cards(await response.json())
+        except Exception as e:
+            self.logger.debug("Couldn't parse job cards response %s: %s", response.url, e)
+            return
+
+        self.responses += 1
+
+        # A results page may be loaded in several chunks, each with an offset of its own
+        page_start = get_start(response.url) // self.page_size * self.page_size
+        cards = self.pages.setdefault(page_start, {})
+
+        for record in records:
+            cards[record["jobid"]] = record
+
+
+    async def take(self, start: int) -> List[Dict[str, str]]:
+        """
+        Returns the cards received for the results page starting at offset
+        `start`, once the responses still being read are parsed. Cards of that
+        page and the ones before it are dropped, those of later pages are kept
+        """
+        if self.pending:
+            await asyncio.gather(*self.pending, return_exceptions=True)
+
+        cards = list(self.pages.get(start, {}).values())
+
+        for page_start in [page_start for page_start in self.pages if page_start <= start]:
+            del self.pages[page_start]
+
+        return cards
+
+
+def main() -> None:
+    """
+    Prints the job cards parsed from saved API responses, such as the
+    `.body` files of a recorded session, as JSON lines
+    """
+    if len(sys.argv) < 2:
+        sys.exit("usage: python -m scraper.api_parser RESPONSE.json [...]")
+
+    for path in sys.argv[1:]:
+        with open(path, encoding="utf-8") as response_file:
+            for record in parse_job_cards(json.load(response_file)):
+                print(json.dumps(record, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,42 @@
 import logging
-import socket
+import json
 import sys
 import os
+import asyncio
 import subprocess
 import time
+import urllib.request
+from typing import List, Union
 from playwright.async_api import async_playwright, Page, Browser, BrowserContext, Playwright
 
 
+# Seconds to wait for a launched Chrome to accept CDP connections
+CDP_READY_TIMEOUT = 30
+
+# First & longest delay, in seconds, between CDP readiness checks
+CDP_POLL_MIN_DELAY = 0.05
+CDP_POLL_MAX_DELAY = 1.0
+
+# Seconds between health checks of a warm browser
+WARM_BROWSER_CHECK_INTERVAL = 10
+
+
+def get_process_rss() -> Union[int, None]:
+    """
+    Returns the resident memory of this process in bytes, or `None` where
+    `/proc` isn't available
+    """
+    try:
+        with open("/proc/self/status") as status_file:
+            for line in status_file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+
+    return None
+
+
 class BrowserManager:
     """Handles browser connections and closing"""
 
@@ -16,17 +46,37 @@ class BrowserManager:
     page: Page
     chrome_process: subprocess.Popen
     playwright: Playwright
+    cdp_url: str
+    profile_path: str
+    is_shard: bool
+    warm: bool
+    opened_pages: List[Page]
 
-    def __init__(self, logger: logging.Logger):
+    def __init__(self, logger: logging.Logger, cdp_url: str = None, profile_path: str = None,
+                 warm: bool = False):
+        """
+        Passing a `cdp_url` runs the manager as a shard, one of several Chrome
+        instances on distinct ports, which never kills the other instances.
+        A `warm` manager attaches to a long-lived Chrome, launching it if
+        needed, and leaves it running when done
+        """
         self.logger = logger
         self.browser = None
         self.context = None
         self.page = None
         self.chrome_process = None
         self.playwright = None
+        self.is_shard = cdp_url is not None
+        self.cdp_url = cdp_url or os.getenv('CDP_URL', 'http://127.0.0.1:9222')
+        self.profile_path = profile_path
+        self.warm = warm
+        self.opened_pages = []
 
     
     def get_chrome_profile_path(self) -> str:
+        if self.profile_path:
+            return self.profile_path
+
         if sys.platform == "darwin":  # macOS
             default_path = os.path.expanduser("~/Library/Application Support/Google/Chrome")
         elif sys.platform == "win32":  # Windows
@@ -64,7 +114,7 @@ class BrowserManager:
         return os.getenv("CHROME_PATH", default_path)
 
 
-    async def connect_to_existing_chrome(self, cdp_url: str) -> Page:
+    async def connect_to_existing_chrome(self, cdp_url: str, reuse_page: bool = True) -> Page:
         """
         Connects to an existing Chrome session via CDP
         """
@@ -72,59 +122,56 @@ class BrowserManager:
         self.browser = await self.playwright.chromium.connect_over_cdp(cdp_url)
         self.context = self.browser.contexts[0] if self.browser.contexts else await self.browser.new_context()
 
-        if self.context.pages:
+        if reuse_page and self.context.pages:
             self.page = self.context.pages[0]  # Reuse existing page
         else:
-            self.page = await self.context.new_page()
+            self.page = await self.new_page()
 
         self.logger.info("✅ Browser Connected to existing Chrome")
         return self.page
 
 
+    async def launch_headless_browser(self) -> Page:
+        """
+        Launches a fresh headless Chromium, without a user profile, for
+        sessions that don't need to be logged in such as replays
+        """
+        self.playwright = await async_playwright().start()
+        self.browser = await self.playwright.chromium.launch(headless=True)
+        self.context = await self.browser.new_context()
+        self.page = await self.context.new_page()
+
+        self.logger.info("✅ Headless Browser Launched")
+        return self.page
+
+
     async def start_chrome_with_cdp(self) -> Page:
         """
         Starts a new Chrome process with a specific user profile and connects Playwright to it
         """
-        cdp_url = os.getenv('CDP_URL', 'http://127.0.0.1:9222')
-        host, port = cdp_url.replace("http://", "").split(":")
-        port = int(port)
+        cdp_url = self.cdp_url
         self.logger.debug(f"CDP URL: {cdp_url}")
-        # Sets up the correct Chrome profile name and profile name
-        chrome_profile_name = os.getenv('CHROME_PROFILE_NAME', "Default")
-        chrome_profile_path = self.get_chrome_profile_path()
-        chrome_path = self.get_chrome_executable_path()
+
+        if self.warm:
+            return await self.attach_to_warm_chrome()
 
         # Checks if Chrome is already running before launching
         if self.is_chrome_running():
             self.logger.info("✅ Chrome is already running. Skipping startup.")
         else:
-            self.logger.info("🔄 Stopping existing Chrome processes...")
-            self.kill_chrome_process()
+            # Shards run next to other Chrome instances, so they must leave them alone
+            if not self.is_shard:
+                self.logger.info("🔄 Stopping existing Chrome processes...")
+                self.kill_chrome_process()
 
-            self.logger.info(f"🔄 Starting Chrome on {host}:{port} using profile {chrome_profile_path}/{chrome_profile_name}...")
-
-            self.chrome_process = subprocess.Popen([
-                chrome_path,
-                f"--remote-debugging-port={port}",
-                f"--user-data-dir={chrome_profile_path}",
-                f"--profile-directory={chrome_profile_name}",  # This sets the actual profile
-                "--no-first-run",
-                "--no-default-browser-check",
-                "--disable-background-mode",
-                "--disable-extensions",
-                "--disable-sync",
-                "--disable-default-apps",
-                "--disable-popup-blocking",
-                "--disable-gpu",
-            ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-
-            time.sleep(3)  # Wait for Chrome to start
+            self.chrome_process = self.launch_chrome()
+            await self.wait_for_cdp()
 
         try:
             self.playwright = await async_playwright().start()
             self.browser = await self.playwright.chromium.connect_over_cdp(cdp_url)
             self.context = self.browser.contexts[0] if self.browser.contexts else await self.browser.new_context()
-            self.page = await self.context.new_page()
+            self.page = await self.new_page()
             self.logger.info("✅ Chrome Started and Connected via CDP")
             return self.page
 
@@ -135,21 +182,166 @@ class BrowserManager:
             raise e
 
 
-    def is_chrome_running(self) -> bool:
+    def launch_chrome(self, detached: bool = False) -> subprocess.Popen:
         """
-        Checks if Chrome is already running with CDP enabled
+        Launches Chrome with remote debugging on the CDP port. A `detached`
+        Chrome runs in its own session, so it outlives this process
+        """
+        port = int(self.cdp_url.replace("http://", "").split(":")[1])
+        # Sets up the correct Chrome profile name and profile name
+        chrome_profile_name = os.getenv('CHROME_PROFILE_NAME', "Default")
+        chrome_profile_path = self.get_chrome_profile_path()
+        chrome_path = self.get_chrome_executable_path()
+
+        self.logger.info(f"🔄 Starting Chrome on port {port} using profile {chrome_profile_path}/{chrome_profile_name}...")
+
+        detach_options = {}
+        if detached:
+            if sys.platform == "win32":
+                detach_options["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+            else:
+                detach_options["start_new_session"] = True
+
+        return subprocess.Popen([
+            chrome_path,
+            f"--remote-debugging-port={port}",
+            f"--user-data-dir={chrome_profile_path}",
+            f"--profile-directory={chrome_profile_name}",  # This sets the actual profile
+            "--no-first-run",
+            "--no-default-browser-check",
+            "--disable-background-mode",
+            "--disable-extensions",
+            "--disable-sync",
+            "--disable-default-apps",
+            "--disable-popup-blocking",
+            "--disable-gpu",
+        ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **detach_options)
+
+
+    async def attach_to_warm_chrome(self) -> Page:
+        """
+        Attaches to the long-lived Chrome on the CDP port with a page of its
+        own, relaunching Chrome first if it isn't healthy
+        """
+        await self.ensure_warm_chrome()
+
+        page = await self.connect_to_existing_chrome(self.cdp_url, reuse_page=False)
+        self.logger.info("♨️ Attached to warm Chrome")
+        return page
+
+
+    async def ensure_warm_chrome(self) -> None:
         """
-        cdp_url = os.getenv('CDP_URL', 'http://127.0.0.1:9222')
-        host, port = cdp_url.replace("http://", "").split(":")
-        port = int(port)
+        Relaunches the warm Chrome, detached, if it doesn't answer on the CDP port
+        """
+        if await self.is_cdp_ready_async():
+            return
+
+        self.logger.info("🔄 Warm Chrome isn't responding, relaunching it...")
+        if not self.is_shard:
+            self.kill_chrome_process()
+
+        self.launch_chrome(detached=True)
+        await self.wait_for_cdp()
+
 
+    async def keep_warm(self, interval: float = WARM_BROWSER_CHECK_INTERVAL) -> None:
+        """
+        Keeps a warm Chrome running for scraper runs to attach to, health
+        checking it every `interval` seconds and relaunching it when it dies
+        """
+        self.logger.info(f"♨️ Keeping Chrome warm on {self.cdp_url}")
+
+        while True:
+            try:
+                await self.ensure_warm_chrome()
+            except Exception as e:
+                self.logger.critical(f"❌ Failed to relaunch warm Chrome: {e}")
+
+            await asyncio.sleep(interval)
+
+
+    def is_cdp_ready(self, timeout: float = 1.0) -> bool:
+        """
+        Checks if Chrome answers on the CDP `/json/version` endpoint
+        """
         try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            result = sock.connect_ex((host, port))
-            sock.close()
-            return result == 0  # If port is open, Chrome is running
+            with urllib.request.urlopen(f"{self.cdp_url}/json/version", timeout=timeout) as response:
+                return response.status == 200 and "webSocketDebuggerUrl" in json.load(response)
         except Exception:
             return False
+
+
+    async def is_cdp_ready_async(self) -> bool:
+        return await asyncio.get_running_loop().run_in_executor(None, self.is_cdp_ready)
+
+
+    async def wait_for_cdp(self, timeout: float = CDP_READY_TIMEOUT) -> None:
+        """
+        Polls the CDP endpoint, backing off exponentially, until Chrome accepts
+        connections. Raises if it doesn't within `timeout` seconds
+        """
+        deadline = time.monotonic() + timeout
+        delay = CDP_POLL_MIN_DELAY
+
+        while not await self.is_cdp_ready_async():
+            if time.monotonic() >= deadline:
+                raise RuntimeError(f"Chrome didn't accept CDP connections on {self.cdp_url} within {timeout}s")
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, CDP_POLL_MAX_DELAY)
+
+        self.logger.debug(f"CDP ready on {self.cdp_url}")
+
+
+    async def new_page(self) -> Page:
+        """
+        Opens a new page in the connected browser context
+        """
+        page = await self.context.new_page()
+        self.opened_pages.append(page)
+        return page
+
+
+    async def recycle_page(self, page: Page) -> Page:
+        """
+        Replaces `page` with a new one, freeing everything its renderer held on to
+        """
+        new_page = await self.new_page()
+
+        if page in self.opened_pages:
+            self.opened_pages.remove(page)
+        await page.close()
+
+        self.logger.info("♻️ Recycled page")
+        return new_page
+
+
+    async def get_js_heap_size(self, page: Page) -> Union[int, None]:
+        """
+        Returns the bytes of JS heap used by `page`, read from the CDP
+        `Performance.getMetrics` of its renderer
+        """
+        try:
+            session = await self.context.new_cdp_session(page)
+            try:
+                await session.send("Performance.enable")
+                performance = await session.send("Performance.getMetrics")
+            finally:
+                await session.detach()
+        except Exception as e:
+            self.logger.debug(f"Couldn't read page performance metrics: {e}")
+            return None
+
+        return next((int(metric["value"]) for metric in performance["metrics"]
+                     if metric["name"] == "JSHeapUsedSize"), None)
+
+
+    def is_chrome_running(self) -> bool:
+        """
+        Checks if Chrome is already running with CDP enabled
+        """
+        return self.is_cdp_ready()
         
 
     def kill_chrome_process(self) -> None:
@@ -159,20 +351,19 @@ class BrowserManager:
         subprocess.run(["pkill", "-f", "Google Chrome"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
 
-    async def cleanup_context(self) -> None:
+    async def close_browser(self) -> None:
         """
-        Closes extra Playwright pages to free up memory
+        Closes the Playwright browser session and kills Chrome if needed. A
+        warm Chrome is left running, only the pages opened by this run are closed
         """
-        if len(await self.context.pages()) > 5:
-            self.logger.info("🧹 Closing extra pages to free up memory...")
-            for page in (await self.context.pages())[1:]:
-                await page.close()
+        if self.warm:
+            for page in self.opened_pages:
+                if not page.is_closed():
+                    await page.close()
 
+            self.logger.info("✅ Detached from warm Chrome")
+            return
 
-    async def close_browser(self) -> None:
-        """
-        Closes the Playwright browser session and kills Chrome if needed
-        """
         if self.browser:
             await self.browser.close()
             self.logger.info("✅ Successfully closed the browser")
@@ -1,6 +1,93 @@
 import logging
 import sqlite3
 import os
+import re
+from contextlib import nullcontext
+from datetime import datetime, timedelta, timezone
+from typing import Any, ContextManager, Dict, Iterable, Iterator, List, Set, Tuple, Union
+from .metrics import Metrics
+from .migrations import migrate
+
+# Stays under SQLite's default limit of 999 host parameters per statement
+MAX_QUERY_PARAMS = 900
+
+# Seconds a connection waits on a lock held by another process, such as
+# another scraper shard, before failing
+BUSY_TIMEOUT = 30
+
+# Pragmas applied to every connection. WAL lets readers run alongside the
+# writer and, with `synchronous=NORMAL`, only fsyncs on checkpoints
+CONNECTION_PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA cache_size=-20000',
+    'PRAGMA temp_store=MEMORY',
+)
+
+# Insert statements are shared by the single and batched writes, so
+# sqlite3's statement cache can reuse their prepared form. A job seen again
+# only has its `last_seen` moved forward
+INSERT_JOB_QUERY = '''
+    INSERT INTO jobs (jobid, title, company, company_id, location, remote_status, linkedin_url,
+                      first_seen, last_seen)
+    VALUES (?, ?, ?, (SELECT id FROM employers WHERE company = ?), ?, ?, ?, ?, ?)
+    ON CONFLICT (jobid) DO UPDATE SET
+        last_seen = excluded.last_seen,
+        company_id = COALESCE(jobs.company_id, excluded.company_id)
+'''
+
+# Full-text index over the searchable `jobs` columns, kept in sync by triggers
+CREATE_JOBS_FTS_QUERIES = (
+    '''
+        CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+            title, company, location, remote_status,
+            content='jobs', content_rowid='id'
+        );
+    ''',
+    '''
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+            INSERT INTO jobs_fts (rowid, title, company, location, remote_status)
+            VALUES (new.id, new.title, new.company, new.location, new.remote_status);
+        END;
+    ''',
+    '''
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+            INSERT INTO jobs_fts (jobs_fts, rowid, title, company, location, remote_status)
+            VALUES ('delete', old.id, old.title, old.company, old.location, old.remote_status);
+        END;
+    ''',
+    '''
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_update
+        AFTER UPDATE OF title, company, location, remote_status ON jobs BEGIN
+            INSERT INTO jobs_fts (jobs_fts, rowid, title, company, location, remote_status)
+            VALUES ('delete', old.id, old.title, old.company, old.location, old.remote_status);
+            INSERT INTO jobs_fts (rowid, title, company, location, remote_status)
+            VALUES (new.id, new.title, new.company, new.location, new.remote_status);
+        END;
+    ''',
+)
+
+# A quoted phrase or a single term of a search
+SEARCH_TOKEN_PATTERN = re.compile(r'"([^"]+)"|(\S+)')
+
+INSERT_EMPLOYER_QUERY = '''
+    INSERT OR IGNORE INTO employers (company, state)
+    VALUES (?, ?)
+'''
+
+
+def utc_now() -> str:
+    """Returns the current UTC time as an ISO 8601 string, as stored in the database"""
+    return datetime.now(timezone.utc).isoformat()
+
+
+def job_params(job: Tuple[str, str, str, str, str, str], seen_at: str) -> tuple:
+    """
+    Returns the `INSERT_JOB_QUERY` parameters of a `(jobid, title, company,
+    location, remote_status, linkedin_url)` job seen at `seen_at`
+    """
+    jobid, title, company, location, remote_status, linkedin_url = job
+    return (jobid, title, company, company, location, remote_status, linkedin_url, seen_at, seen_at)
 
 
 class DatabaseManager:
@@ -10,21 +97,42 @@ class DatabaseManager:
     """
 
     logger: logging.Logger
+    known_jobids: Set[str]
+    rows_written: int
+    has_fts: bool
+    defer_commits: bool
+    search: str
+    schema_version: int
+    metrics: Metrics
 
-    def __init__(self, logger: logging.Logger):
+    def __init__(self, logger: logging.Logger, cache_known_jobs: bool = False, metrics: Metrics = None):
         self.logger = logger
+        self.metrics = metrics
         self.db_path = os.getenv('DATABASE_PATH')
         self.conn = None
         self.cursor = None
+        self.known_jobids = None
+        self.rows_written = 0
+        self.has_fts = False
+        self.defer_commits = False
+        self.search = ''
+        self.schema_version = 0
         self.connect()
         self.setup_database()
+
+        if cache_known_jobs:
+            self.load_known_jobids()
     
 
     def connect(self):
         """Establish a persistent database connection"""
         try:
-            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self.conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT, check_same_thread=False,
+                                        cached_statements=256)
             self.cursor = self.conn.cursor()
+
+            for pragma in CONNECTION_PRAGMAS:
+                self.cursor.execute(pragma)
             self.logger.info("✅ Database connected successfully")
         except sqlite3.Error as e:
             self.logger.critical(f"❌ Database connection failed: {e}")
@@ -39,62 +147,110 @@ class DatabaseManager:
             self.logger.info("✅ Database connection closed")
 
 
+    def _timed(self, operation: str) -> ContextManager:
+        """Times the body of the `with` block into `metrics`, if set, under the current `search`"""
+        if not self.metrics:
+            return nullcontext()
+
+        return self.metrics.timer(operation, self.search)
+
+
+    def commit(self):
+        """Commit the current transaction"""
+        try:
+            with self._timed('db_commit'):
+                self.conn.commit()
+        except sqlite3.Error as e:
+            self.logger.critical(f"❌ Database commit failed: {e}")
+            raise e
+
+
+    def _commit(self):
+        """Commits the current transaction, unless commits are deferred to a group commit"""
+        if not self.defer_commits:
+            with self._timed('db_commit'):
+                self.conn.commit()
+
+
     def _execute_query(self, query, params=()):
         """Execute a SQL query and commits it"""
         try:
-            self.cursor.execute(query, params)
-            self.conn.commit()
+            with self._timed('db_execute'):
+                self.cursor.execute(query, params)
+            self._commit()
+            self.rows_written += max(self.cursor.rowcount, 0)
         except sqlite3.Error as e:
             self.logger.critical(f"❌ Database commit query failed: {e}")
             raise e
 
 
+    def _execute_many(self, query, params_list):
+        """Execute a SQL query for every entry of `params_list` in one transaction"""
+        try:
+            with self._timed('db_execute_many'):
+                self.cursor.executemany(query, params_list)
+            self._commit()
+            self.rows_written += max(self.cursor.rowcount, 0)
+        except sqlite3.Error as e:
+            # A deferred transaction also holds other writes, which must not be lost
+            if not self.defer_commits:
+                self.conn.rollback()
+            self.logger.critical(f"❌ Database commit many query failed: {e}")
+            raise e
+
+
     def _fetch_query(self, query, params=()):
         """Fetch results from a SQL query"""
         try:
-            self.cursor.execute(query, params)
-            return self.cursor.fetchall()
+            with self._timed('db_fetch'):
+                self.cursor.execute(query, params)
+                return self.cursor.fetchall()
         except sqlite3.Error as e:
             self.logger.critical(f"❌ Database fetch query failed: {e}")
             raise e
 
 
     def setup_database(self):
-        create_jobs_query = '''
-            CREATE TABLE IF NOT EXISTS jobs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                jobid TEXT UNIQUE,
-                title TEXT,
-                company TEXT,
-                location TEXT,
-                remote_status TEXT,
-                linkedin_url TEXT
-            );
-        ''' 
-
-        create_employers_query = '''
-            CREATE TABLE IF NOT EXISTS employers (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                company TEXT UNIQUE,
-                state TEXT
-            );
-        '''
-
-        try:
-            self._execute_query(create_jobs_query)
-        except Exception as e:
-            self.logger.critical(f"❌ Error creating jobs table")
-            raise e
-
-        try:
-            self._execute_query(create_employers_query)
-        except Exception as e:
-            self.logger.critical(f"❌ Error creating employers table")
-            raise e
+        """
+        Brings the schema up to date with the versioned migrations, then sets up the search index
+        """
+        self.schema_version = migrate(self.conn, self.logger)
+        self.setup_search_index()
         
         self.logger.info("✅ Database setup successful")
 
 
+    def setup_search_index(self) -> None:
+        """
+        Creates the `jobs_fts` full-text index and its triggers, backfilling it
+        from the `jobs` table the first time. Searches fall back to `LIKE`
+        scans when SQLite is built without FTS5
+        """
+        is_new_index = not self._fetch_query("SELECT name FROM sqlite_master WHERE name = 'jobs_fts'")
+
+        try:
+            for query in CREATE_JOBS_FTS_QUERIES:
+                self.cursor.execute(query)
+
+            if is_new_index:
+                self.cursor.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('rebuild')")
+                self.logger.info("✅ Backfilled jobs full-text index")
+
+            self.conn.commit()
+            self.has_fts = True
+        except sqlite3.OperationalError as e:
+            self.conn.rollback()
+            self.logger.warning(f"Full-text search unavailable, falling back to LIKE scans: {e}")
+
+
+    def rebuild_search_index(self) -> None:
+        """
+        Rebuilds the `jobs_fts` full-text index from the `jobs` table
+        """
+        if self.has_fts:
+            self._execute_query("INSERT INTO jobs_fts (jobs_fts) VALUES ('rebuild')")
+
+
     def add_job(self, jobid: str, title: str, company: str, location: str,
                 remote_status: str, linkedin_url: str) -> None:
         """
@@ -105,12 +261,13 @@ class DatabaseManager:
                 self.logger.critical(f"❌ Skipping: can't insert job, is missing either {company} or {title}")
                 return
 
-            self._execute_query('''
-                INSERT OR IGNORE INTO jobs (jobid, title, company, location, remote_status, linkedin_url)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (jobid, title, company, location, remote_status, linkedin_url))
+            job = (jobid, title, company, location, remote_status, linkedin_url)
+            self._execute_query(INSERT_JOB_QUERY, job_params(job, utc_now()))
+
+            if self.known_jobids is not None:
+                self.known_jobids.add(jobid)
 
-            self.logger.info(f"✅ Job Added To DB: {company} - {title} - {location}")
+            self.logger.info("✅ Job Added To DB: %s - %s - %s", company, title, location)
         except sqlite3.Error as e:
             self.logger.critical(f"❌ Skipping: error when adding new job to db: {e}")
         
@@ -124,30 +281,283 @@ class DatabaseManager:
                 self.logger.critical(f"❌ Skipping: can't insert employer, is missing either {company} or {state}")
                 return
             
-            self._execute_query('''
-                INSERT OR IGNORE INTO employers (company, state)
-                VALUES (?, ?)
-            ''', (company, state))
+            self._execute_query(INSERT_EMPLOYER_QUERY, (company, state))
 
-            self.logger.info(f'✅ Employer Added To DB: {company} - {state}')
+            self.logger.info('✅ Employer Added To DB: %s - %s', company, state)
         except sqlite3.Error as e:
             self.logger.critical(f"❌ Skipping: error when adding new employer to db: {e}")
 
 
-    def search_jobs(self, search_term: str) -> None:
+    def add_jobs_many(self, jobs: List[Tuple[str, str, str, str, str, str]]) -> None:
+        """
+        Adds many job entities into the `jobs` table in a single transaction.
+        Each job is a `(jobid, title, company, location, remote_status, linkedin_url)` tuple.
+        Its employer is linked if it was stored first
+        """
+        valid_jobs = []
+        for job in jobs:
+            jobid, title, company = job[:3]
+            if not jobid or not company or not title:
+                self.logger.critical(f"❌ Skipping: can't insert job, is missing either {company} or {title}")
+                continue
+            valid_jobs.append(job)
+
+        if not valid_jobs:
+            return
+
+        try:
+            seen_at = utc_now()
+            self._execute_many(INSERT_JOB_QUERY, [job_params(job, seen_at) for job in valid_jobs])
+        except sqlite3.Error as e:
+            self.logger.critical(f"❌ Skipping: error when adding new jobs to db: {e}")
+            return
+
+        if self.known_jobids is not None:
+            self.known_jobids.update(job[0] for job in valid_jobs)
+
+        self.logger.info("✅ %d Jobs Added To DB", len(valid_jobs))
+
+
+    def touch_jobs(self, jobids: Iterable[str], search_key: str) -> None:
+        """
+        Marks the stored jobs among `jobids` as seen now, by the search `search_key`
+        """
+        jobids = list(dict.fromkeys(jobid for jobid in jobids if jobid))
+        seen_at = utc_now()
+
+        try:
+            for i in range(0, len(jobids), MAX_QUERY_PARAMS):
+                chunk = tuple(jobids[i:i + MAX_QUERY_PARAMS])
+                placeholders = ','.join('?' * len(chunk))
+
+                with self._timed('db_execute'):
+                    self.cursor.execute(f'UPDATE jobs SET last_seen = ? WHERE jobid IN ({placeholders})',
+                                        (seen_at,) + chunk)
+                    self.cursor.execute(f'''
+                        INSERT INTO job_searches (jobid, search_key, first_seen, last_seen)
+                        SELECT jobid, ?, ?, ? FROM jobs WHERE jobid IN ({placeholders})
+                        ON CONFLICT (jobid, search_key) DO UPDATE SET last_seen = excluded.last_seen
+                    ''', (search_key, seen_at, seen_at) + chunk)
+
+            self._commit()
+        except sqlite3.Error as e:
+            if not self.defer_commits:
+                self.conn.rollback()
+            self.logger.critical(f"❌ Error marking jobs of {search_key} as seen: {e}")
+
+
+    def update_job_details(self, jobid: str, description: str, seniority_level: str,
+                           applicant_count: Union[int, None]) -> None:
+        """
+        Stores the details scraped from the page of job `jobid`
+        """
+        try:
+            self._execute_query('''
+                UPDATE jobs
+                SET description = ?, seniority_level = ?, applicant_count = ?, details_scraped_at = ?
+                WHERE jobid = ?
+            ''', (description, seniority_level, applicant_count, utc_now(), jobid))
+
+            self.logger.info("✅ Job Details Added To DB: %s", jobid)
+        except sqlite3.Error as e:
+            self.logger.critical(f"❌ Skipping: error when adding job details to db: {e}")
+
+
+    def add_employers_many(self, employers: List[Tuple[str, str]]) -> None:
+        """
+        Adds many employer entities into the `employers` table in a single
+        transaction. Each employer is a `(company, state)` tuple
+        """
+        valid_employers = []
+        for company, state in dict.fromkeys(employers):
+            if not company or not state:
+                self.logger.critical(f"❌ Skipping: can't insert employer, is missing either {company} or {state}")
+                continue
+            valid_employers.append((company, state))
+
+        if not valid_employers:
+            return
+
+        try:
+            self._execute_many(INSERT_EMPLOYER_QUERY, valid_employers)
+        except sqlite3.Error as e:
+            self.logger.critical(f"❌ Skipping: error when adding new employers to db: {e}")
+            return
+
+        self.logger.info('✅ %d Employers Added To DB', len(valid_employers))
+
+
+    @staticmethod
+    def build_fts_query(search_term: str) -> str:
+        """
+        Turns `search_term` into an FTS5 query matching every one of its terms.
+        Quoted parts are matched as phrases and terms ending in `*` as prefixes,
+        any other FTS5 syntax is escaped
+        """
+        tokens = []
+        for phrase, term in SEARCH_TOKEN_PATTERN.findall(search_term):
+            if phrase:
+                tokens.append('"{}"'.format(phrase.replace('"', '""')))
+            elif term.endswith('*') and term.strip('*'):
+                tokens.append('"{}"*'.format(term.strip('*').replace('"', '""')))
+            else:
+                tokens.append('"{}"'.format(term.replace('"', '""')))
+
+        return ' '.join(tokens)
+
+
+    def search_jobs(self, search_term: str, limit: int = 50, offset: int = 0) -> List[tuple]:
         """
-        Logs all jobs that contain the `search_term` in any of it's fields
+        Returns the `jobs` rows matching `search_term` in any of their searchable
+        fields, best matches first, paginated by `limit` & `offset`
         """
-        jobs = self._fetch_query('''
-                    SELECT * FROM jobs
-                    WHERE title LIKE ? OR company LIKE ? OR location LIKE ? OR remote_status LIKE ?
-                ''', tuple(['%' + search_term + '%'] * 4))
+        fts_query = self.build_fts_query(search_term)
+        if not fts_query:
+            return []
+
+        if self.has_fts:
+            jobs = self._fetch_query('''
+                        SELECT jobs.* FROM jobs_fts
+                        JOIN jobs ON jobs.id = jobs_fts.rowid
+                        WHERE jobs_fts MATCH ?
+                        ORDER BY jobs_fts.rank
+                        LIMIT ? OFFSET ?
+                    ''', (fts_query, limit, offset))
+        else:
+            jobs = self._fetch_query('''
+                        SELECT * FROM jobs
+                        WHERE title LIKE ? OR company LIKE ? OR location LIKE ? OR remote_status LIKE ?
+                        ORDER BY id DESC
+                        LIMIT ? OFFSET ?
+                    ''', tuple(['%' + search_term + '%'] * 4) + (limit, offset))
         
         if not jobs:
             self.logger.info("No matching jobs found")
         else:
-            for job in jobs:
-                self.logger.info(job)
+            self.logger.info(f"Found {len(jobs)} matching jobs")
+
+        return jobs
+
+
+    def iter_jobs(self, since_id: int = 0, batch_size: int = 1000) -> Iterator[Tuple[List[str], List[tuple]]]:
+        """
+        Streams the `jobs` rows after `since_id`, in `id` order, as
+        `(column_names, rows)` batches of `batch_size` rows. Reads through a
+        cursor of its own, so memory stays flat regardless of the table's size
+        """
+        cursor = self.conn.cursor()
+
+        try:
+            cursor.execute('SELECT * FROM jobs WHERE id > ? ORDER BY id', (since_id,))
+            columns = [column[0] for column in cursor.description]
+
+            while True:
+                with self._timed('db_fetch'):
+                    rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+
+                yield columns, rows
+        except sqlite3.Error as e:
+            self.logger.critical(f"❌ Error streaming jobs from DB: {e}")
+            raise e
+        finally:
+            cursor.close()
+
+
+    def get_column_types(self, table: str) -> Dict[str, str]:
+        """
+        Returns the declared type of every column of `table`, by name
+        """
+        return {row[1]: row[2] for row in self._fetch_query(f'PRAGMA table_info({table})')}
+
+
+    def get_export_watermark(self, name: str) -> int:
+        """
+        Returns the last `jobs.id` the incremental export `name` got to, `0` if it never ran
+        """
+        rows = self._fetch_query('SELECT last_id FROM export_watermarks WHERE name = ?', (name,))
+        return rows[0][0] if rows else 0
+
+
+    def save_export_watermark(self, name: str, last_id: int) -> None:
+        """
+        Moves the watermark of the incremental export `name` to `last_id`
+        """
+        self._execute_query('''
+            INSERT INTO export_watermarks (name, last_id, exported_at)
+            VALUES (?, ?, ?)
+            ON CONFLICT (name) DO UPDATE SET last_id = excluded.last_id, exported_at = excluded.exported_at
+        ''', (name, last_id, utc_now()))
+
+
+    def get_database_size(self) -> int:
+        """
+        Returns the bytes the database takes on disk, write-ahead log included
+        """
+        return sum(os.path.getsize(path) for path in (self.db_path, f'{self.db_path}-wal') if os.path.exists(path))
+
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Returns a summary of the stored jobs, employers & searches
+        """
+        jobs, detailed_jobs = self._fetch_query('SELECT COUNT(*), COUNT(details_scraped_at) FROM jobs')[0]
+        last_day = (datetime.now(timezone.utc) - timedelta(days=1)).isoformat()
+
+        return {
+            "schema_version": self.schema_version,
+            "database_bytes": self.get_database_size(),
+            "jobs": jobs,
+            "jobs_with_details": detailed_jobs,
+            "jobs_first_seen_last_day": self._fetch_query(
+                'SELECT COUNT(*) FROM jobs WHERE first_seen >= ?', (last_day,)
+            )[0][0],
+            "employers": self._fetch_query('SELECT COUNT(*) FROM employers')[0][0],
+            "jobs_by_remote_status": dict(self._fetch_query('''
+                SELECT COALESCE(NULLIF(remote_status, ''), 'unspecified'), COUNT(*) FROM jobs
+                GROUP BY 1 ORDER BY 2 DESC
+            ''')),
+            "top_companies": dict(self._fetch_query('''
+                SELECT employers.company, COUNT(*) FROM jobs
+                JOIN employers ON employers.id = jobs.company_id
+                GROUP BY jobs.company_id ORDER BY 2 DESC LIMIT 10
+            ''')),
+            "crawl_states": dict(self._fetch_query('SELECT status, COUNT(*) FROM crawl_state GROUP BY status')),
+            # SQLite returns the other columns of the row holding MAX(id), the latest run
+            "last_search_runs": [
+                dict(zip(("search", "finished_at", "pages", "cards", "new_jobs", "stop_reason"), row[:1] + row[2:]))
+                for row in self._fetch_query('''
+                    SELECT search_key, MAX(id), finished_at, pages, cards, new_jobs, stop_reason
+                    FROM search_runs GROUP BY search_key ORDER BY finished_at DESC
+                ''')
+            ],
+        }
+
+
+    def vacuum(self) -> Tuple[int, int]:
+        """
+        Merges the full-text index segments, rebuilds the database file
+        without its free pages, truncates the write-ahead log and refreshes
+        the query planner statistics. Returns the database size before & after
+        """
+        size_before = self.get_database_size()
+
+        try:
+            if self.has_fts:
+                self.cursor.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('optimize')")
+            self.conn.commit()
+
+            # VACUUM can't run inside a transaction
+            self.cursor.execute('VACUUM')
+            self.cursor.execute('ANALYZE')
+            self.conn.commit()
+            self.cursor.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        except sqlite3.Error as e:
+            self.logger.critical(f"❌ Database vacuum failed: {e}")
+            raise e
+
+        return size_before, self.get_database_size()
 
 
     def is_a_new_job(self, jobid: str) -> bool:
@@ -164,3 +574,83 @@ class DatabaseManager:
         return not job
 
 
+    def load_known_jobids(self) -> None:
+        """
+        Warms an in-memory set with every job id in the `jobs` table, so
+        duplicate checks can skip the database
+        """
+        rows = self._fetch_query('SELECT jobid FROM jobs')
+        self.known_jobids = {row[0] for row in rows}
+        self.logger.info(f"✅ Loaded {len(self.known_jobids)} known job ids")
+
+
+    def filter_new_jobs(self, jobids: Iterable[str]) -> List[str]:
+        """
+        Returns the `jobids` not found in the `jobs` table, keeping their order.
+        Uses the known job id set when loaded, otherwise one query per
+        `MAX_QUERY_PARAMS` ids
+        """
+        jobids = list(dict.fromkeys(jobid for jobid in jobids if jobid))
+
+        if self.known_jobids is not None:
+            return [jobid for jobid in jobids if jobid not in self.known_jobids]
+
+        found = set()
+        for i in range(0, len(jobids), MAX_QUERY_PARAMS):
+            chunk = jobids[i:i + MAX_QUERY_PARAMS]
+            placeholders = ','.join('?' * len(chunk))
+
+            try:
+                rows = self._fetch_query(f'SELECT jobid FROM jobs WHERE jobid IN ({placeholders})', tuple(chunk))
+            except sqlite3.Error as e:
+                self.logger.critical(f"Error filtering new jobs in DB: {e}")
+                raise e
+
+            found.update(row[0] for row in rows)
+
+        return [jobid for jobid in jobids if jobid not in found]
+
+
+    def get_crawl_state(self, search_key: str) -> Union[Tuple[int, str, str, str], None]:
+        """
+        Returns the `(last_page, cursor, status, updated_at)` checkpoint of a
+        search, or `None` if it was never crawled
+        """
+        rows = self._fetch_query('''
+            SELECT last_page, cursor, status, updated_at FROM crawl_state WHERE search_key = ?
+        ''', (search_key,))
+
+        return rows[0] if rows else None
+
+
+    def save_crawl_state(self, search_key: str, last_page: int, cursor: str, status: str) -> None:
+        """
+        Checkpoints a search at its last completed results page. `cursor` is
+        the last job id of that page
+        """
+        try:
+            self._execute_query('''
+                INSERT INTO crawl_state (search_key, last_page, cursor, status, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (search_key) DO UPDATE SET
+                    last_page = excluded.last_page,
+                    cursor = excluded.cursor,
+                    status = excluded.status,
+                    updated_at = excluded.updated_at
+            ''', (search_key, last_page, cursor, status, utc_now()))
+        except sqlite3.Error as e:
+            self.logger.critical(f"❌ Error saving crawl state of {search_key}: {e}")
+
+
+    def add_search_run(self, search_key: str, started_at: str, finished_at: str, pages: int,
+                       cards: int, new_jobs: int, stop_reason: str) -> None:
+        """
+        Records the yield of one run of a search into the `search_runs` table
+        """
+        try:
+            self._execute_query('''
+                INSERT INTO search_runs (search_key, started_at, finished_at, pages, cards, new_jobs, stop_reason)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (search_key, started_at, finished_at, pages, cards, new_jobs, stop_reason))
+        except sqlite3.Error as e:
+            self.logger.critical(f"❌ Error recording search run of {search_key}: {e}")
@@ -0,0 +1,193 @@
+import time
+import queue
+import asyncio
+import logging
+import threading
+from typing import Any, Tuple, Union
+from .database_manager import DatabaseManager
+from .metrics import Metrics
+
+
+# Calls are committed together once this many are pending...
+GROUP_COMMIT_SIZE = 100
+
+# ...or once the oldest pending write is this many seconds old
+GROUP_COMMIT_INTERVAL = 1.0
+
+# Calls queued for the writer thread before callers have to wait
+MAX_QUEUED_CALLS = 1000
+
+# Seconds between retries while the queue is full
+QUEUE_FULL_BACKOFF = 0.01
+
+
+class DatabaseWriter:
+    """
+    Runs a `DatabaseManager` on a dedicated thread that owns its connection,
+    so SQLite never blocks the event loop. Calls are drained in order from a
+    bounded queue and writes are group-committed by size or time
+    """
+
+    logger: logging.Logger
+    database_manager: DatabaseManager
+    cache_known_jobs: bool
+    metrics: Metrics
+    group_commit_size: int
+    group_commit_interval: float
+    queue: queue.Queue
+    thread: threading.Thread
+
+    def __init__(self, logger: logging.Logger, cache_known_jobs: bool = False, metrics: Metrics = None,
+                 group_commit_size: int = GROUP_COMMIT_SIZE,
+                 group_commit_interval: float = GROUP_COMMIT_INTERVAL):
+        self.logger = logger
+        self.database_manager = None
+        self.cache_known_jobs = cache_known_jobs
+        self.metrics = metrics
+        self.group_commit_size = group_commit_size
+        self.group_commit_interval = group_commit_interval
+        self.queue = queue.Queue(maxsize=MAX_QUEUED_CALLS)
+        self.thread = None
+
+
+    def start(self) -> None:
+        """
+        Starts the writer thread, which connects to the database. Raises if
+        the connection or the database setup fail
+        """
+        ready = threading.Event()
+        errors = []
+
+        self.thread = threading.Thread(target=self._run, args=(ready, errors), name="database-writer", daemon=True)
+        self.thread.start()
+        ready.wait()
+
+        if errors:
+            raise errors[0]
+
+
+    async def call(self, method: str, *args, search: str = '') -> Any:
+        """
+        Runs `DatabaseManager.<method>(*args)` on the writer thread and returns
+        its result, after every call queued before it. Its database timings
+        are recorded under `search`
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        await self._put((method, args, search, (loop, future)))
+        return await future
+
+
+    async def submit(self, method: str, *args, search: str = '') -> None:
+        """
+        Queues `DatabaseManager.<method>(*args)` for the writer thread without
+        waiting for it to run, its timings recorded under `search`. Only waits
+        while the queue is full
+        """
+        await self._put((method, args, search, None))
+
+
+    async def close(self) -> None:
+        """
+        Drains the queue, commits what's pending and closes the connection
+        """
+        if not self.thread:
+            return
+
+        await self._put(None)
+        await asyncio.get_running_loop().run_in_executor(None, self.thread.join)
+        self.thread = None
+
+
+    async def _put(self, item: Union[Tuple, None]) -> None:
+        # A blocking put would stall the event loop, so a full queue is polled instead
+        while True:
+            try:
+                self.queue.put_nowait(item)
+                return
+            except queue.Full:
+                await asyncio.sleep(QUEUE_FULL_BACKOFF)
+
+
+    def _run(self, ready: threading.Event, errors: list) -> None:
+        try:
+            self.database_manager = DatabaseManager(self.logger, self.cache_known_jobs, self.metrics)
+            self.database_manager.defer_commits = True
+        except Exception as e:
+            errors.append(e)
+            return
+        finally:
+            ready.set()
+
+        pending_calls = 0
+        first_pending_at = None
+
+        while True:
+            timeout = None
+            if pending_calls:
+                timeout = max(0, first_pending_at + self.group_commit_interval - time.monotonic())
+
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = ()
+
+            if item is None:
+                break
+
+            if item:
+                method, args, search, waiter = item
+                self._execute(method, args, search, waiter)
+
+                if not pending_calls:
+                    first_pending_at = time.monotonic()
+                pending_calls += 1
+
+            is_batch_full = pending_calls >= self.group_commit_size
+            is_batch_due = pending_calls and time.monotonic() - first_pending_at >= self.group_commit_interval
+
+            if is_batch_full or is_batch_due:
+                self._group_commit(pending_calls)
+                pending_calls = 0
+
+        self.database_manager.defer_commits = False
+        self.database_manager.close()
+
+
+    def _execute(self, method: str, args: tuple, search: str, waiter: Union[Tuple, None]) -> None:
+        self.database_manager.search = search
+
+        try:
+            result = getattr(self.database_manager, method)(*args)
+        except Exception as e:
+            self.logger.critical(f"❌ Database writer error running {method}: {e}")
+            if waiter:
+                loop, future = waiter
+                loop.call_soon_threadsafe(self._resolve, future, None, e)
+            return
+
+        if waiter:
+            loop, future = waiter
+            loop.call_soon_threadsafe(self._resolve, future, result, None)
+
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, result: Any, error: Union[Exception, None]) -> None:
+        if future.cancelled():
+            return
+
+        if error:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+
+    def _group_commit(self, pending_calls: int) -> None:
+        # A group commit holds the writes of every search, so it's timed under none
+        self.database_manager.search = ''
+
+        try:
+            self.database_manager.commit()
+            self.logger.debug("Group Committed %d Database Calls", pending_calls)
+        except Exception as e:
+            self.logger.critical(f"❌ Database writer group commit of {pending_calls} calls failed: {e}")
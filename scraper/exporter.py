@@ -0,0 +1,205 @@
+import os
+import csv
+import json
+import logging
+import argparse
+from abc import ABC, abstractmethod
+from typing import Dict, IO, List, Tuple
+from dotenv import load_dotenv
+from .database_manager import DatabaseManager
+from .log_setup import setup_logging
+
+
+# Rows fetched & written at a time, so exports stay in constant memory
+EXPORT_BATCH_SIZE = 1000
+
+FORMAT_JSONL = 'jsonl'
+FORMAT_CSV = 'csv'
+FORMAT_PARQUET = 'parquet'
+EXPORT_FORMATS = (FORMAT_JSONL, FORMAT_CSV, FORMAT_PARQUET)
+
+
+def guess_format(path: str) -> str:
+    """
+    Returns the export format matching the extension of `path`, JSONL by default
+    """
+    extension = os.path.splitext(path)[1].lstrip('.').lower()
+    return extension if extension in EXPORT_FORMATS else FORMAT_JSONL
+
+
+class RowWriter(ABC):
+    """Writes batches of rows to an open output file"""
+
+    def __init__(self, output: IO, columns: List[str]):
+        self.output = output
+        self.columns = columns
+
+
+    @abstractmethod
+    def write(self, rows: List[tuple]) -> None:
+        pass
+
+
+    def close(self) -> None:
+        pass
+
+
+class JsonLinesWriter(RowWriter):
+
+    def write(self, rows: List[tuple]) -> None:
+        self.output.writelines(
+            json.dumps(dict(zip(self.columns, row)), ensure_ascii=False, default=str) + '\n' for row in rows
+        )
+
+
+class CsvWriter(RowWriter):
+
+    def __init__(self, output: IO, columns: List[str]):
+        super().__init__(output, columns)
+        self.writer = csv.writer(output)
+        self.writer.writerow(columns)
+
+
+    def write(self, rows: List[tuple]) -> None:
+        self.writer.writerows(rows)
+
+
+class ParquetWriter(RowWriter):
+    """Writes every batch as a row group, needs `pyarrow`"""
+
+    def __init__(self, output: IO, columns: List[str], column_types: Dict[str, str]):
+        super().__init__(output, columns)
+
+        # Optional dependency, only needed for Parquet exports
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as e:
+            raise RuntimeError("Parquet exports need pyarrow, install it with `pip install pyarrow`") from e
+
+        self.pyarrow = pyarrow
+        self.schema = pyarrow.schema([
+            (column, pyarrow.int64() if 'INT' in column_types.get(column, '').upper() else pyarrow.string())
+            for column in columns
+        ])
+        self.writer = pyarrow.parquet.ParquetWriter(output, self.schema)
+
+
+    def write(self, rows: List[tuple]) -> None:
+        batch = self.pyarrow.RecordBatch.from_arrays(
+            [self.pyarrow.array(column, type=field.type) for column, field in zip(zip(*rows), self.schema)],
+            schema=self.schema,
+        )
+        self.writer.write_batch(batch)
+
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class JobExporter:
+    """
+    Streams the `jobs` table into JSONL, CSV or Parquet files. An incremental
+    export only writes the jobs added since the previous run of the same
+    name, tracked by a watermark on `jobs.id`
+    """
+
+    database_manager: DatabaseManager
+    logger: logging.Logger
+
+    def __init__(self, database_manager: DatabaseManager, logger: logging.Logger):
+        self.database_manager = database_manager
+        self.logger = logger
+
+
+    def open_writer(self, output: IO, export_format: str, columns: List[str]) -> RowWriter:
+        if export_format == FORMAT_PARQUET:
+            return ParquetWriter(output, columns, self.database_manager.get_column_types('jobs'))
+        if export_format == FORMAT_CSV:
+            return CsvWriter(output, columns)
+
+        return JsonLinesWriter(output, columns)
+
+
+    def export(self, path: str, export_format: str = None, since_last: str = None,
+               batch_size: int = EXPORT_BATCH_SIZE) -> Tuple[int, int]:
+        """
+        Writes the jobs into `path`, all of them or, with `since_last`, only
+        those added since the last export by that name. The file is written
+        next to `path` and moved in place once complete, and only then is the
+        watermark moved forward. With nothing new, `path` is still replaced
+        by an empty export, so it never holds rows already loaded. Returns
+        how many jobs were written and the last job `id`
+        """
+        export_format = export_format or guess_format(path)
+        since_id = self.database_manager.get_export_watermark(since_last) if since_last else 0
+        last_id = since_id
+        count = 0
+
+        # Suffixed with the pid, so exports running together never share a temp file
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        if export_format == FORMAT_PARQUET:
+            output = open(temp_path, 'wb')
+        else:
+            output = open(temp_path, 'w', newline='', encoding='utf-8')
+
+        try:
+            with output:
+                # Opened before the first batch, so an export without rows still gets its header or schema
+                columns = list(self.database_manager.get_column_types('jobs'))
+                writer = self.open_writer(output, export_format, columns)
+
+                try:
+                    for columns, rows in self.database_manager.iter_jobs(since_id, batch_size):
+                        writer.write(rows)
+                        count += len(rows)
+                        last_id = rows[-1][columns.index('id')]
+                finally:
+                    writer.close()
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+        os.replace(temp_path, path)
+
+        if since_last:
+            self.database_manager.save_export_watermark(since_last, last_id)
+
+        if count:
+            self.logger.info(f"📦 Exported {count} jobs to {path} ({export_format}), up to id {last_id}")
+        else:
+            self.logger.info(f"No jobs to export after id {since_id}, wrote an empty {path}")
+        return count, last_id
+
+
+def add_export_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("output", help="File to write the jobs into")
+    parser.add_argument("--format", choices=EXPORT_FORMATS,
+                        help="Output format, guessed from the output's extension by default (JSONL otherwise)")
+    parser.add_argument("--since_last", metavar="NAME",
+                        help="Only export the jobs added since the last export named NAME, then move its watermark")
+    parser.add_argument("--batch_size", type=int, default=EXPORT_BATCH_SIZE,
+                        help=f"Rows read & written at a time (default {EXPORT_BATCH_SIZE})")
+
+
+def run_export(args: argparse.Namespace, logger: logging.Logger) -> None:
+    database_manager = DatabaseManager(logger)
+
+    try:
+        JobExporter(database_manager, logger).export(args.output, args.format, args.since_last,
+                                                     max(1, args.batch_size))
+    finally:
+        database_manager.close()
+
+
+def main() -> None:
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Export the scraped jobs")
+    add_export_arguments(parser)
+    args = parser.parse_args()
+
+    run_export(args, setup_logging(os.getenv('LOGGING_PATH'), 'INFO'))
+
+
+if __name__ == "__main__":
+    main()
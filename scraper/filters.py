@@ -0,0 +1,166 @@
+import os
+import re
+import logging
+from abc import ABC, abstractmethod
+from typing import Dict, List, Tuple, Union
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+# Fields of an extracted job card the rules can match on
+FILTER_FIELDS = ("title", "company", "location", "remote_status")
+
+# Ways of matching a rule's terms in a field
+BACKEND_REGEX = 'regex'
+BACKEND_AHO_CORASICK = 'aho-corasick'
+
+# A card is skipped if a blocklist term is in its field, or if none of an allowlist's terms are
+BLOCKLIST = 'blocklist'
+ALLOWLIST = 'allowlist'
+
+
+def read_terms(name: str) -> List[str]:
+    """
+    Returns the comma-separated terms of the `name` env var, without empty ones
+    """
+    return [term.strip() for term in os.getenv(name, '').split(',') if term.strip()]
+
+
+def is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+class TermMatcher(ABC):
+    """Finds any of a list of terms in a text, compiled once for the whole run"""
+
+    terms: List[str]
+    ignore_case: bool
+    word_boundaries: bool
+
+    def __init__(self, terms: List[str], ignore_case: bool = False, word_boundaries: bool = False):
+        self.ignore_case = ignore_case
+        self.word_boundaries = word_boundaries
+        self.terms = [self.normalize(term) for term in terms]
+
+
+    def normalize(self, text: str) -> str:
+        return text.casefold() if self.ignore_case else text
+
+
+    @abstractmethod
+    def search(self, text: str) -> Union[str, None]:
+        """
+        Returns the first term found in `text`, or `None`
+        """
+
+
+class RegexMatcher(TermMatcher):
+    """Matches all the terms with a single alternation, longest terms first"""
+
+    pattern: re.Pattern
+
+    def __init__(self, terms: List[str], ignore_case: bool = False, word_boundaries: bool = False):
+        super().__init__(terms, ignore_case, word_boundaries)
+
+        alternation = '|'.join(re.escape(term) for term in sorted(set(self.terms), key=len, reverse=True))
+        if word_boundaries:
+            # Lookarounds instead of \b, which misbehaves next to terms ending in punctuation
+            alternation = rf'(?<!\w)(?:{alternation})(?!\w)'
+
+        self.pattern = re.compile(alternation)
+
+
+    def search(self, text: str) -> Union[str, None]:
+        match = self.pattern.search(self.normalize(text))
+        return match.group(0) if match else None
+
+
+class AhoCorasickMatcher(TermMatcher):
+    """Matches all the terms in a single pass over the text with a `pyahocorasick` automaton"""
+
+    automaton: 'ahocorasick.Automaton'
+
+    def __init__(self, terms: List[str], ignore_case: bool = False, word_boundaries: bool = False):
+        super().__init__(terms, ignore_case, word_boundaries)
+
+        self.automaton = ahocorasick.Automaton()
+        for term in self.terms:
+            self.automaton.add_word(term, term)
+        self.automaton.make_automaton()
+
+
+    def search(self, text: str) -> Union[str, None]:
+        text = self.normalize(text)
+
+        for end, term in self.automaton.iter(text):
+            start = end - len(term) + 1
+
+            if self.word_boundaries and (
+                (start > 0 and is_word_char(text[start - 1]))
+                or (end + 1 < len(text) and is_word_char(text[end + 1]))
+            ):
+                continue
+
+            return term
+
+        return None
+
+
+class CardFilter:
+    """
+    Decides which job cards to skip from the `<FIELD>_BLOCKLIST` and
+    `<FIELD>_ALLOWLIST` env vars of every field in `FILTER_FIELDS`, such as
+    `COMPANY_ALLOWLIST`. `TERMS_BLOCKLIST` is the title blocklist. Every list
+    is compiled into a matcher once, so checking a card costs one pass per rule
+    """
+
+    logger: logging.Logger
+    rules: List[Tuple[str, str, TermMatcher]]
+
+    def __init__(self, logger: logging.Logger, backend: str = BACKEND_REGEX,
+                 ignore_case: bool = False, word_boundaries: bool = False):
+        self.logger = logger
+
+        if backend == BACKEND_AHO_CORASICK and ahocorasick is None:
+            self.logger.warning("⚠️ pyahocorasick isn't installed, filtering with the regex backend")
+            backend = BACKEND_REGEX
+
+        matcher_class = AhoCorasickMatcher if backend == BACKEND_AHO_CORASICK else RegexMatcher
+        self.rules = []
+
+        for field in FILTER_FIELDS:
+            for kind in (BLOCKLIST, ALLOWLIST):
+                terms = read_terms(f'{field.upper()}_{kind.upper()}')
+
+                if field == 'title' and kind == BLOCKLIST:
+                    terms += read_terms('TERMS_BLOCKLIST')
+
+                if terms:
+                    self.rules.append((field, kind, matcher_class(terms, ignore_case, word_boundaries)))
+
+        self.logger.debug("Compiled %d card filter rules with the %s backend", len(self.rules), backend)
+
+
+    def check(self, card: Dict[str, str], complete: bool = True) -> Union[str, None]:
+        """
+        Returns why `card` should be skipped, or `None` if it passes every
+        rule. Unless the card is `complete`, its empty fields, such as those
+        of cards that haven't rendered yet, are left for a later check
+        """
+        for field, kind, matcher in self.rules:
+            value = card.get(field) or ''
+            if not value and not complete:
+                continue
+
+            term = matcher.search(value)
+
+            if kind == BLOCKLIST and term is not None:
+                return f"{field} contains blocked term '{term}'"
+
+            if kind == ALLOWLIST and term is None:
+                return f"{field} '{value}' isn't allowed"
+
+        return None
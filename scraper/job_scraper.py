@@ -1,145 +1,663 @@
 import os
+import asyncio
 import logging
 import argparse
-from typing import List
-from .browser_manager import BrowserManager
-from .database_manager import DatabaseManager
+from typing import List, Dict, Tuple, Union
+from playwright.async_api import Page
+from .browser_manager import BrowserManager, get_process_rss
+from .database_manager import utc_now
+from .database_writer import DatabaseWriter
 from .page_handler import PageHandler
+from .session_store import SessionStore, SessionRecorder, SessionReplayer
+from .request_blocker import RequestBlocker
+from .metrics import Metrics
+from .rate_limiter import RateLimiter
+from .api_parser import ApiJobCards
+from .filters import CardFilter
+from .search import JOBS_PER_PAGE, Search, build_search_url
 from locators import LOCATORS 
 
+# Statuses of a search's checkpoint in the `crawl_state` table
+CRAWL_RUNNING = 'running'
+CRAWL_COMPLETED = 'completed'
+CRAWL_FAILED = 'failed'
+
+# Job ids waiting for a detail worker, producers wait while it's full
+DETAIL_QUEUE_SIZE = 100
+
+# Why a search stopped paginating, recorded in the `search_runs` table
+STOP_EXHAUSTED = 'exhausted'
+STOP_STALE = 'stale'
+STOP_FAILED = 'failed'
+
+BYTES_PER_MB = 1024 * 1024
+
 
 class JobScraper:
     """Handles the automation of scraping job listings from LinkedIn"""
 
     browser_manager: BrowserManager
-    database_manager: DatabaseManager
-    page_handler: PageHandler
+    database: DatabaseWriter
     logger: logging.Logger
-    job_search: str
-    location: str
-    terms_block_list: List[str]
+    searches: List[Search]
+    workers: int
+    page_pool: asyncio.Queue
+    detail_workers: int
+    detail_queue: asyncio.Queue
+    card_filter: CardFilter
+    record_dir: str
+    replay_dir: str
+    request_blocker: RequestBlocker
+    url_pagination: bool
+    start_page: int
+    fresh: bool
+    incremental: bool
+    stale_pages: int
+    stale_fraction: float
+    wait_mode: str
+    jitter_min: float
+    jitter_max: float
+    rate_limiter: RateLimiter
+    metrics: Metrics
+    metrics_report: str
+    prometheus_file: str
+    stats: Dict[str, int]
+    recycle_pages: int
+    js_heap_limit: int
+    rss_limit: int
+    api_cards: bool
 
     def __init__(self, args: argparse.Namespace, logger: logging.Logger):
-        self.browser_manager = BrowserManager(logger)
-        self.database_manager = DatabaseManager(logger)
-        self.page_handler = None
+        self.browser_manager = BrowserManager(logger, args.cdp_url, args.chrome_profile_path, args.warm_browser)
+        self.wait_mode = args.wait_mode
+        self.jitter_min = args.jitter_min
+        self.jitter_max = max(args.jitter_min, args.jitter_max)
+        self.rate_limiter = None
+
+        if args.rate:
+            self.rate_limiter = RateLimiter(logger, args.rate, args.burst, args.rate_jitter,
+                                            args.rate_jitter_scale, args.rate_state_file)
+        self.metrics_report = args.metrics_report
+        self.prometheus_file = args.prometheus_file
+        self.metrics = Metrics(args.shard) if self.metrics_report or self.prometheus_file else None
+        self.database = DatabaseWriter(logger, args.cache_known_jobs, self.metrics)
         self.logger = logger
-        self.job_search = args.job_search
-        self.location = args.location
-        self.terms_block_list = os.getenv('TERMS_BLOCKLIST').split(',')
+        self.searches = args.searches
+        self.workers = max(1, min(args.workers, len(self.searches)))
+        self.page_pool = None
+        self.detail_workers = max(0, args.detail_workers)
+        self.detail_queue = None
+        self.card_filter = CardFilter(logger, args.filter_backend, args.filter_ignore_case,
+                                      args.filter_word_boundaries)
+        self.record_dir = args.record
+        self.replay_dir = args.replay
+        self.request_blocker = RequestBlocker(logger) if args.block_resources else None
+        self.url_pagination = args.url_pagination
+        self.start_page = max(1, args.start_page)
+        self.fresh = args.fresh
+        self.incremental = args.incremental
+        self.stale_pages = max(1, args.stale_pages)
+        self.stale_fraction = args.stale_fraction
+        self.stats = {"pages": 0, "cards": 0}
+        self.recycle_pages = max(0, args.recycle_pages)
+        self.js_heap_limit = args.js_heap_limit_mb * BYTES_PER_MB
+        self.rss_limit = args.rss_limit_mb * BYTES_PER_MB
+        self.api_cards = args.api_cards
 
     
     async def run(self):
         """
-        Starts the job scraper, connects to Chrome, and iterates through job listings
+        Starts the job scraper, connects to Chrome, and runs every search
+        concurrently with one page per worker. When detail workers are
+        enabled, the searches produce job ids for them to enrich on pages of
+        their own, with the database writer as the sink of both stages. On
+        the way out the writer is closed before the browser, so its pending
+        group commit is never lost to a failed browser teardown
         """
-        self.page = await self.browser_manager.start_chrome_with_cdp()
-        self.page_handler = PageHandler(self.page, self.logger)
+        self.database.start()
+        detail_tasks = []
 
-        self.logger.info('Scraper Initiated & Running')
+        try:
+            if self.replay_dir:
+                page = await self.browser_manager.launch_headless_browser()
+            else:
+                page = await self.browser_manager.start_chrome_with_cdp()
+        except BaseException:
+            await self.database.close()
+            raise
 
         try:
-            pagination_page = 1
-            await self.page_handler.go_to_url(f"{os.getenv('JOB_SEARCH_BASE_URL')}", 3, 5)
+            await self.install_session_hooks()
 
-            await self.page_handler.fill_element(LOCATORS['job_keyword_search'], self.job_search, "Keyword Input", 2, 4)
-            
-            location_inputs = await self.page_handler.get_elements(LOCATORS['job_location_search'])
-            await self.page_handler.fill_element(location_inputs[0], self.location, "Location Input", 2, 4)
+            self.page_pool = asyncio.Queue()
+            self.page_pool.put_nowait(page)
+
+            for _ in range(self.workers - 1):
+                self.page_pool.put_nowait(await self.browser_manager.new_page())
+
+            self.logger.info(f'Scraper Initiated & Running {len(self.searches)} Searches On {self.workers} Pages')
+
+            detail_tasks = await self.start_detail_workers()
+
+            semaphore = asyncio.Semaphore(self.workers)
+            await asyncio.gather(*(self.run_search(search, semaphore) for search in self.searches))
+
+            await self.stop_detail_workers(detail_tasks)
+        except Exception as e:
+            self.logger.critical(f'Error occurred {e}')
+        finally:
+            # Stops the detail workers an error left running, so nothing writes after the writer closes
+            await self.cancel_detail_workers(detail_tasks)
+            await self.database.close()
+
+            try:
+                if self.request_blocker:
+                    self.request_blocker.log_summary()
+
+                await self.browser_manager.close_browser()
+                await self.browser_manager.playwright.stop()
+            finally:
+                self.write_metrics()
+
+
+    def new_page_handler(self, page: Page, label: str) -> PageHandler:
+        """
+        Returns a `PageHandler` for `page` with the run's settings, timing its operations under `label`
+        """
+        # Replayed sessions are served from disk, so there's nothing to wait for
+        wait_scale = 0 if self.replay_dir else 1
+
+        return PageHandler(page, self.logger, wait_scale, self.metrics, label,
+                           self.wait_mode, self.jitter_min, self.jitter_max, self.rate_limiter)
+
+
+    async def start_detail_workers(self) -> List[asyncio.Task]:
+        """
+        Starts the detail workers, each on a page of its own, fed by `detail_queue`
+        """
+        if not self.detail_workers:
+            return []
+
+        self.detail_queue = asyncio.Queue(maxsize=DETAIL_QUEUE_SIZE)
+        tasks = []
+
+        for worker in range(self.detail_workers):
+            page_handler = self.new_page_handler(await self.browser_manager.new_page(), 'job_details')
+            tasks.append(asyncio.create_task(self.run_detail_worker(page_handler), name=f"detail-worker-{worker}"))
+
+        self.logger.info(f'Started {self.detail_workers} Job Detail Workers')
+        return tasks
+
+
+    async def stop_detail_workers(self, tasks: List[asyncio.Task]) -> None:
+        """
+        Waits for the detail workers to drain `detail_queue`, then stops them
+        """
+        if not tasks:
+            return
+
+        await self.detail_queue.join()
+        await self.cancel_detail_workers(tasks)
+
+
+    async def cancel_detail_workers(self, tasks: List[asyncio.Task]) -> None:
+        """
+        Stops the detail workers right away, dropping the job ids still queued
+        """
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+    async def run_detail_worker(self, page_handler: PageHandler) -> None:
+        """
+        Opens the page of every job id in `detail_queue` and stores its details
+        """
+        while True:
+            jobid = await self.detail_queue.get()
+
+            try:
+                await page_handler.go_to_url(f"{os.getenv('JOBS_PAGE_BASE_URL')}{jobid}", 2, 4,
+                                             wait_for_selector=LOCATORS['job_description'])
+
+                details = await page_handler.extract_job_details(
+                    LOCATORS['job_description'], LOCATORS['job_insights'], LOCATORS['job_top_card_description']
+                )
+
+                if details:
+                    await self.database.submit('update_job_details', jobid, details['description'],
+                                               details['seniority_level'], details['applicant_count'],
+                                               search='job_details')
+            except Exception as e:
+                self.logger.warning(f'Error scraping details of job {jobid}: {e}')
+            finally:
+                self.detail_queue.task_done()
+
+
+    def write_metrics(self) -> None:
+        """
+        Writes the run's timings as a JSON report and a Prometheus textfile, if requested
+        """
+        try:
+            if self.metrics_report:
+                self.metrics.write_json(self.metrics_report)
+                self.logger.info(f'📊 Performance report written to {self.metrics_report}')
+
+            if self.prometheus_file:
+                self.metrics.write_prometheus(self.prometheus_file)
+                self.logger.info(f'📊 Prometheus metrics written to {self.prometheus_file}')
+        except OSError as e:
+            self.logger.warning(f'Error writing performance metrics: {e}')
+
+
+    async def install_session_hooks(self) -> None:
+        """
+        Records the session into `record_dir` or replays it from `replay_dir`,
+        and blocks heavy resources, if set
+        """
+        context = self.browser_manager.context
+
+        if self.replay_dir:
+            replayer = SessionReplayer(SessionStore(self.replay_dir, self.logger), self.logger)
+            await replayer.install(context)
+        elif self.record_dir:
+            recorder = SessionRecorder(SessionStore(self.record_dir, self.logger), self.logger)
+            recorder.attach(context)
+
+        # Installed last so it runs before the replay route
+        if self.request_blocker:
+            await self.request_blocker.install(context)
+
+
+    async def run_search(self, search: Search, semaphore: asyncio.Semaphore) -> None:
+        """
+        Waits for a free worker page and scrapes `search` on it
+        """
+        async with semaphore:
+            page = await self.page_pool.get()
 
-            await self.page_handler.click_and_wait(LOCATORS['search_button'], "Search Button")
+            page_handler = self.new_page_handler(page, search.key)
+
+            try:
+                await self.scrape_search(page_handler, search)
+            except Exception as e:
+                self.logger.critical(f'Error occurred scraping {search}: {e}')
+            finally:
+                # The search may have recycled its page, so the current one goes back
+                self.page_pool.put_nowait(page_handler.page)
+
+
+    async def scrape_search(self, page_handler: PageHandler, search: Search) -> None:
+        """
+        Loads the LinkedIn Jobs search page, searches for `search` and
+        iterates through its paginated results, checkpointing every completed
+        page so a failed crawl resumes where it stopped. In incremental mode
+        results are sorted by most recent and the search stops once
+        `stale_pages` pages in a row were mostly known jobs. Those crawls
+        always start over and their pages don't line up with the relevance
+        sorted ones, so they leave the checkpoint alone
+        """
+        self.logger.info(f'Starting Search: {search}')
+
+        pagination_page = await self.get_resume_page(search)
+        last_page = pagination_page - 1
+        cursor = None
+        search_run = {"started_at": utc_now(), "pages": 0, "cards": 0, "new_jobs": 0}
+        stale_pages = 0
+        pages_since_recycle = 0
+        stop_reason = STOP_EXHAUSTED
+        api_cards = None
+
+        if self.api_cards:
+            api_cards = ApiJobCards(self.logger, JOBS_PER_PAGE)
+            api_cards.attach(page_handler.page)
+
+        try:
+            # Any results page but the first one can only be reached directly by its URL,
+            # and the form can't sort by most recent
+            if self.url_pagination or self.incremental or pagination_page > 1:
+                await page_handler.go_to_url(self.search_url(search, pagination_page), 3, 5,
+                                             wait_for_selector=LOCATORS['job_cards'])
+            else:
+                await self.fill_search_form(page_handler, search)
             
             self.logger.debug('Start Iterating Jobs')
 
             while True:
-                await self.page_handler.scroll_element_into_view(LOCATORS['pagination_list'], 'Pagination List')
+                await page_handler.scroll_element_into_view(LOCATORS['pagination_list'], 'Pagination List')
+
+                job_cards, new_job_count = await self.scrape_results_page(page_handler, search, pagination_page,
+                                                                          api_cards)
+                if not job_cards:
+                    # A search that's empty from the start is more likely throttled than exhausted
+                    if self.rate_limiter and not search_run["pages"]:
+                        await self.rate_limiter.penalize(f'Empty results for {search}')
 
-                job_cards = await self.page_handler.get_elements(LOCATORS['job_cards'])
+                    self.logger.info(f'No job cards found, done with search: {search}')
+                    break
 
-                for i in range(len(job_cards)):
-                    card = job_cards[i]
-                    card_name = f"Card: {i + 1}"
+                if self.rate_limiter:
+                    await self.rate_limiter.reward()
 
-                    self.logger.debug(f"Inspecting Job {card_name}")
+                search_run["pages"] += 1
+                search_run["cards"] += len(job_cards)
+                search_run["new_jobs"] += new_job_count
 
-                    jobid = await self.page_handler.get_element_property(card, 'data-job-id')
-                    is_new_job = self.database_manager.is_a_new_job(jobid)
+                last_page = pagination_page
+                cursor = job_cards[-1]['jobid']
+                await self.save_checkpoint(search, last_page, cursor, CRAWL_RUNNING)
 
-                    if not is_new_job:
-                        self.logger.info('Repeat Job Found, Skip')
-                        continue
+                if self.incremental:
+                    stale_pages = stale_pages + 1 if self.is_stale_page(job_cards, new_job_count) else 0
 
-                    element_handle = await card.element_handle()
-                    await self.page_handler.scroll_element_into_view(element_handle, card_name)
-                    await self.page_handler.click_and_wait(card, card_name, 2, 4)
-                    
-                    company_locator = card.locator(LOCATORS['company'])
-                    company = await self.page_handler.get_element_text(company_locator)
-                    self.logger.debug(f'Got Company Name: {company}')
+                    if stale_pages >= self.stale_pages:
+                        self.logger.info(f'{stale_pages} Stale Pages In A Row, done with search: {search}')
+                        stop_reason = STOP_STALE
+                        break
 
-                    # Adds company to employer table if it's a new one
-                    self.database_manager.add_employer(company, os.getenv('STATE'))
+                pagination_page += 1
+                pages_since_recycle += 1
 
-                    title_locator = card.locator(LOCATORS['job_title'])
-                    job_title = await self.page_handler.get_element_text(title_locator)
-                    self.logger.debug(f'Got Job Title: {job_title}')
+                if await self.should_recycle_page(page_handler.page, pages_since_recycle):
+                    # A fresh page has no results list to click through, so it picks up by URL
+                    page_handler.page = await self.browser_manager.recycle_page(page_handler.page)
+                    pages_since_recycle = 0
 
-                    if self.contains_blocked_term(job_title):
-                        self.logger.debug('Blocked Term Found, Skip')
-                        continue
-                    
-                    has_remote_status = False
-                    job_location_locator = card.locator(LOCATORS['job_location'])
-                    job_location_string = await self.page_handler.get_element_text(job_location_locator)
-                    job_location = ''
-                    job_remote_status = ''
+                    if api_cards:
+                        api_cards.attach(page_handler.page)
+                    await page_handler.go_to_url(self.search_url(search, pagination_page), 3, 5,
+                                                 wait_for_selector=LOCATORS['job_cards'])
+                elif not await self.go_to_next_page(page_handler, search, pagination_page, job_cards[0]['jobid']):
+                    self.logger.info(f'No results page {pagination_page}, done with search: {search}')
+                    break
+        except Exception:
+            await self.save_checkpoint(search, last_page, cursor, CRAWL_FAILED)
+            stop_reason = STOP_FAILED
+            raise
+        else:
+            await self.save_checkpoint(search, last_page, cursor, CRAWL_COMPLETED)
+        finally:
+            if api_cards:
+                api_cards.detach()
 
-                    if ' (' in job_location_string:
-                        job_location_string = job_location_string.split(' (')
-                        has_remote_status = True
+            await self.database.submit(
+                'add_search_run', search.key, search_run["started_at"], utc_now(), search_run["pages"],
+                search_run["cards"], search_run["new_jobs"], stop_reason, search=search.key
+            )
+            self.logger.info(f'Search {search} Yield: {search_run["new_jobs"]} New Jobs Out Of '
+                             f'{search_run["cards"]} Cards On {search_run["pages"]} Pages')
 
-                    if has_remote_status:
-                        job_location = job_location_string[0]
-                        job_remote_status = job_location_string[1].replace(')', '')
-                    else:
-                        job_location = job_location_string
 
-                    self.logger.debug(f'Got Job Location: {job_location}')
+    async def should_recycle_page(self, page: Page, pages_since_recycle: int) -> bool:
+        """
+        Checks if `page` is due to be replaced, after `recycle_pages` results
+        pages or once the page's JS heap or this process' RSS passes its limit
+        """
+        if self.recycle_pages and pages_since_recycle >= self.recycle_pages:
+            self.logger.debug('Recycling page after %d results pages', pages_since_recycle)
+            return True
 
-                    linkedin_url = f"{os.getenv('JOBS_PAGE_BASE_URL')}{jobid}"
-                    self.logger.debug(f'Got LinkedIn URL: {linkedin_url}')
+        if self.js_heap_limit:
+            js_heap = await self.browser_manager.get_js_heap_size(page)
+            if js_heap and js_heap >= self.js_heap_limit:
+                self.logger.info(f'🧠 Page JS heap at {js_heap // BYTES_PER_MB}MB, recycling it')
+                return True
 
-                    self.database_manager.add_job(jobid, job_title, company, job_location, job_remote_status, linkedin_url)
+        if self.rss_limit:
+            rss = get_process_rss()
+            if rss and rss >= self.rss_limit:
+                self.logger.info(f'🧠 Scraper RSS at {rss // BYTES_PER_MB}MB, recycling page')
+                return True
 
-                pagination_page += 1
-                await self.page_handler.scroll_element_into_view(LOCATORS['pagination_list'], 'Pagination List')
-                self.logger.debug(f'Looking for pagination btn {pagination_page}')
-
-                try:
-                    next_pagination_btn_locator = self.page.locator(LOCATORS['pagination_button'](pagination_page), timeout=6000)
-                    if next_pagination_btn_locator:
-                        await self.page_handler.click_and_wait(next_pagination_btn_locator, f"Pagination Btn {pagination_page}")
-                except Exception as e:
-                    self.logger.info(f"Couln't fine next pagination btn, need to click for more")
-                    selector = LOCATORS['more_pagination_buttons'](pagination_page)
-                    self.logger.debug(selector)
-
-                    more_pagination_btn_locator = self.page.locator(selector)
-                    await self.page_handler.click_and_wait(more_pagination_btn_locator, 'Show More Pagination Btn')
-                
-                if pagination_page % 5 == 0:
-                    os.system('clear')
-                
-        except Exception as e:
-            self.logger.critical('Error occurred {e}')
-        finally:
-            await self.browser_manager.close_browser()
-            await self.browser_manager.playwright.stop()
-            self.database_manager.close()
+        return False
+
+
+    def is_stale_page(self, job_cards: List[Dict[str, str]], new_job_count: int) -> bool:
+        """
+        Returns if at least `stale_fraction` of the `job_cards` were already
+        known or filtered out, that is only `new_job_count` of them were stored
+        """
+        known_job_count = len(job_cards) - new_job_count
+        return known_job_count >= self.stale_fraction * len(job_cards)
+
+
+    def search_url(self, search: Search, pagination_page: int) -> str:
+        """
+        Returns the URL of a results page of `search`, sorted by most recent in incremental mode
+        """
+        return build_search_url(search, pagination_page, most_recent=self.incremental)
+
+
+    async def get_resume_page(self, search: Search) -> int:
+        """
+        Returns the results page to start `search` at: the page after its
+        checkpoint if its last crawl didn't complete, otherwise `start_page`
+        """
+        # Incremental crawls always start from the most recent results
+        if self.fresh or self.incremental or self.start_page > 1:
+            return self.start_page
+
+        crawl_state = await self.database.call('get_crawl_state', search.key, search=search.key)
+        if not crawl_state:
+            return self.start_page
+
+        last_page, _, status, updated_at = crawl_state
+        if status == CRAWL_COMPLETED or last_page < 1:
+            return self.start_page
+
+        self.logger.info(f'Resuming Search {search} After Page {last_page}, Checkpointed At {updated_at}')
+        return last_page + 1
+
+
+    async def save_checkpoint(self, search: Search, last_page: int, cursor: str, status: str) -> None:
+        """
+        Checkpoints `search` at `last_page`, unless this is an incremental crawl
+        """
+        if self.incremental:
+            return
+
+        await self.database.submit('save_crawl_state', search.key, last_page, cursor, status, search=search.key)
+
+
+    async def go_to_next_page(self, page_handler: PageHandler, search: Search,
+                              pagination_page: int, previous_jobid: str) -> bool:
+        """
+        Loads the `pagination_page` results page of `search`. `previous_jobid`
+        is the first job of the current page, which tells when the list
+        re-rendered. Returns `False` when there's no such page to go to
+        """
+
+        if self.url_pagination:
+            # A page past the last one loads without cards, which ends the search
+            await page_handler.go_to_url(self.search_url(search, pagination_page), 3, 5,
+                                         wait_for_selector=LOCATORS['job_cards'])
+            return True
+
+        return await self.go_to_pagination_page(page_handler, pagination_page, previous_jobid)
+
+
+    async def fill_search_form(self, page_handler: PageHandler, search: Search) -> None:
+        """
+        Loads the LinkedIn Jobs search page and searches for `search` through its form
+        """
+        await page_handler.go_to_url(f"{os.getenv('JOB_SEARCH_BASE_URL')}", 3, 5)
+
+        await page_handler.fill_element(LOCATORS['job_keyword_search'], search.job_search, "Keyword Input", 2, 4)
+        
+        location_inputs = await page_handler.get_elements(LOCATORS['job_location_search'])
+        await page_handler.fill_element(location_inputs[0], search.location, "Location Input", 2, 4)
+
+        await page_handler.click_and_wait(LOCATORS['search_button'], "Search Button",
+                                          wait_for=lambda: page_handler.wait_for_selector(LOCATORS['job_cards']))
+
+
+    async def go_to_pagination_page(self, page_handler: PageHandler, pagination_page: int,
+                                    previous_jobid: str) -> bool:
+        """
+        Clicks the pagination button of `pagination_page`, revealing more
+        pagination buttons first if needed. Returns if the card list moved on
+        from the `previous_jobid` page, which it doesn't past the last page
+        """
+        page: Page = page_handler.page
+
+        async def wait_for_next_page():
+            await page_handler.wait_for_cards_rerender(LOCATORS['job_cards'], previous_jobid)
+
+        await page_handler.scroll_element_into_view(LOCATORS['pagination_list'], 'Pagination List')
+        self.logger.debug('Looking for pagination btn %d', pagination_page)
+
+        next_pagination_btn_locator = page.locator(LOCATORS['pagination_button'](pagination_page))
+        if await next_pagination_btn_locator.count():
+            await page_handler.click_and_wait(next_pagination_btn_locator, f"Pagination Btn {pagination_page}",
+                                              wait_for=wait_for_next_page)
+        else:
+            self.logger.info("Couldn't find next pagination btn, need to click for more")
+            selector = LOCATORS['more_pagination_buttons'](pagination_page)
+            self.logger.debug(selector)
+
+            more_pagination_btn_locator = page.locator(selector)
+            if not await more_pagination_btn_locator.count():
+                return False
+
+            await page_handler.click_and_wait(more_pagination_btn_locator, 'Show More Pagination Btn',
+                                              wait_for=wait_for_next_page)
+
+        # A click that failed or timed out leaves the same cards in place
+        first_jobid = await page_handler.get_first_jobid(LOCATORS['job_cards'])
+        return first_jobid is not None and first_jobid != previous_jobid
 
         
-    def contains_blocked_term(self, job_title: str) -> bool:
+    async def scrape_results_page(self, page_handler: PageHandler, search: Search, pagination_page: int,
+                                  api_cards: ApiJobCards = None) -> Tuple[List[Dict[str, str]], int]:
         """
-        Returns if input string contains an element in the term block list as a substring
+        Extracts every job card on the current results page in one batch and
+        stores the new ones in a single transaction per table. The cards come
+        from the page's search results API responses when `api_cards` has
+        any for `pagination_page`, and from the DOM otherwise. Returns the extracted cards and how
+        many new jobs were stored. Filtered out cards are never stored, so
+        they count as known, or a page holding one would never turn stale.
+        Raises when the DOM extraction fails, as only a page without cards
+        ends the results
         """
-        return any(sub in job_title for sub in self.terms_block_list)
+        job_cards = await api_cards.take((pagination_page - 1) * JOBS_PER_PAGE) if api_cards else None
+
+        if job_cards:
+            self.logger.debug('Got %d Job Cards From The API', len(job_cards))
+        else:
+            job_cards = await self.extract_job_cards(page_handler, LOCATORS['job_cards'])
+
+            if job_cards is None:
+                raise RuntimeError(f"Couldn't extract the job cards of results page {pagination_page}")
+
+        if not job_cards:
+            return [], 0
+
+        self.stats["pages"] += 1
+        self.stats["cards"] += len(job_cards)
+
+        new_jobids = set(await self.database.call('filter_new_jobs', [card['jobid'] for card in job_cards],
+                                                  search=search.key))
+
+        employers = []
+        jobs = []
+
+        for card in job_cards:
+            jobid = card['jobid']
+            self.logger.debug("Inspecting Job %s", jobid)
+
+            if jobid not in new_jobids:
+                self.logger.debug('Repeat Job Found, Skip')
+                continue
+
+            # Duplicate cards on the same page are only processed once
+            new_jobids.discard(jobid)
+
+            # Filters on the fields the card already shows, before spending a click on it
+            if self.is_filtered_out(card, complete=False):
+                continue
+
+            # The card list renders lazily, so cards that haven't been scrolled
+            # into view yet need to be opened before their fields can be read
+            if not card['title'] or not card['company']:
+                card = await self.inspect_job_card(page_handler, jobid) or card
+
+            if self.is_filtered_out(card):
+                continue
+
+            if not card['title'] or not card['company']:
+                self.logger.debug('Job %s Is Missing Its Title Or Company, Skip', jobid)
+                continue
+
+            employers.append((card['company'], os.getenv('STATE')))
+            jobs.append(self.process_job_card(card))
+
+        # Adds companies to employer table if they're new ones
+        await self.database.submit('add_employers_many', employers, search=search.key)
+        await self.database.submit('add_jobs_many', jobs, search=search.key)
+        self.logger.info('Found %d New Jobs Out Of %d Cards', len(jobs), len(job_cards))
+
+        # Records that the search saw every stored job on the page, new or known
+        await self.database.submit('touch_jobs', [card['jobid'] for card in job_cards], search.key,
+                                   search=search.key)
+
+        # Waits while the detail workers are behind, so memory stays flat
+        if self.detail_queue:
+            for job in jobs:
+                await self.detail_queue.put(job[0])
+
+        return job_cards, len(jobs)
+
+
+    async def inspect_job_card(self, page_handler: PageHandler, jobid: str) -> Union[Dict[str, str], None]:
+        """
+        Scrolls to and clicks the card of `jobid`, then extracts it again
+        """
+        card_selector = f"{LOCATORS['job_cards']}[data-job-id='{jobid}']"
+        card_name = f"Card: {jobid}"
+
+        await page_handler.scroll_element_into_view(card_selector, card_name)
+        await page_handler.click_and_wait(card_selector, card_name, 2, 4,
+                                          wait_for=lambda: page_handler.wait_for_job_details(jobid))
+
+        job_cards = await self.extract_job_cards(page_handler, card_selector)
+        return job_cards[0] if job_cards else None
+
+
+    async def extract_job_cards(self, page_handler: PageHandler,
+                                cards_selector: str) -> Union[List[Dict[str, str]], None]:
+        """
+        Extracts the job cards matched by `cards_selector` using the card field locators
+        """
+        return await page_handler.extract_job_cards(
+            cards_selector, LOCATORS['job_title'], LOCATORS['company'], LOCATORS['job_location']
+        )
+
+
+    def is_filtered_out(self, card: Dict[str, str], complete: bool = True) -> bool:
+        """
+        Returns if `card` is skipped by the filter rules, see `CardFilter.check`
+        """
+        reason = self.card_filter.check(card, complete)
+
+        if reason:
+            self.logger.debug('Filtered Out Job %s: %s', card['jobid'], reason)
+            return True
+
+        return False
+
+
+    def process_job_card(self, card: Dict[str, str]) -> Tuple[str, str, str, str, str, str]:
+        """
+        Returns the `jobs` row of an extracted job card
+        """
+        jobid = card['jobid']
+        company = card['company']
+        job_title = card['title']
+        self.logger.debug('Got Company Name: %s', company)
+        self.logger.debug('Got Job Title: %s', job_title)
+        self.logger.debug("Got Job Location: %s", card['location'])
+
+        linkedin_url = f"{os.getenv('JOBS_PAGE_BASE_URL')}{jobid}"
+        self.logger.debug('Got LinkedIn URL: %s', linkedin_url)
+
+        return (jobid, job_title, company, card['location'], card['remote_status'], linkedin_url)
@@ -0,0 +1,119 @@
+import os
+import sys
+import json
+import queue
+import atexit
+import logging
+import logging.handlers
+from typing import Union
+
+
+# Standard attributes of a `LogRecord`, anything else was passed through `extra`
+RECORD_ATTRIBUTES = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+# Writes the JSON lines sink to stdout, in place of the text console
+JSON_LOG_STDOUT = "-"
+
+
+class JsonLineFormatter(logging.Formatter):
+    """Formats records as compact JSON lines, without the emojis of the text logs"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = record.getMessage()
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "msg": message[len(strip_decoration(message)):],
+        }
+
+        entry.update({key: value for key, value in vars(record).items() if key not in RECORD_ATTRIBUTES})
+
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+
+        return json.dumps(entry, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to the listener thread as they are, so their %-style
+    arguments are only formatted off the event loop, and only if a handler
+    wants them. The arguments must not change after the log call
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def strip_decoration(message: str) -> str:
+    """
+    Returns the leading emojis & spaces of `message`
+    """
+    end = 0
+    while end < len(message) and (not message[end].isascii() or message[end].isspace()):
+        end += 1
+
+    return message[:end]
+
+
+def parse_level(level: Union[str, int]) -> int:
+    return level if isinstance(level, int) else logging.getLevelName(level.upper())
+
+
+def setup_logging(file_path: str, console_level: Union[str, int] = logging.DEBUG,
+                  json_log: str = None) -> logging.Logger:
+    """
+    Sets up & returns a logger with handlers for both the console and the
+    file in `file_path`, plus a JSON lines sink into `json_log` if set ("-"
+    replaces the console text). The logger only queues records, a background
+    thread formats & writes them so logging never blocks the scrape loop
+    """
+    console_level = parse_level(console_level)
+
+    # Creates log directory if it doesn't exist
+    log_dir = os.path.dirname(file_path)
+    os.makedirs(log_dir, exist_ok=True)
+
+    handlers = []
+
+    # Console handler
+    if json_log != JSON_LOG_STDOUT:
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(console_level)
+        console_handler.setFormatter(logging.Formatter('%(levelname)s - %(message)s'))
+        handlers.append(console_handler)
+
+    # File handler
+    try:
+        file_handler = logging.FileHandler(file_path)
+        file_handler.setLevel(logging.ERROR) # Log only errors in file
+        file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s\n'))
+        handlers.append(file_handler)
+    except Exception as e:
+        print(f'Error creating logger file handler: {e}', file=sys.stderr)
+
+    # JSON lines handler
+    if json_log:
+        try:
+            json_handler = (logging.StreamHandler(sys.stdout) if json_log == JSON_LOG_STDOUT
+                            else logging.FileHandler(json_log))
+            json_handler.setLevel(console_level)
+            json_handler.setFormatter(JsonLineFormatter())
+            handlers.append(json_handler)
+        except Exception as e:
+            print(f'Error creating JSON log handler: {e}', file=sys.stderr)
+
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    # Flushes the records still queued when the process exits
+    atexit.register(listener.stop)
+
+    # Initiate logger, dropping calls no handler wants before they're queued
+    logger = logging.getLogger("scraper")
+    logger.setLevel(min(handler.level for handler in handlers) if handlers else logging.CRITICAL)
+    logger.propagate = False
+    logger.handlers.clear()
+    logger.addHandler(DeferredQueueHandler(log_queue))
+
+    return logger
@@ -1,56 +1,260 @@
 import os
+import sys
+import json
+import logging
 import argparse
 import asyncio
-import logging
+from typing import List
 from dotenv import load_dotenv
-from .job_scraper import JobScraper
+from .log_setup import setup_logging
+from .page_handler import WAIT_MODE_RANDOM, WAIT_MODE_CONDITION
+from .rate_limiter import JITTER_NONE, JITTER_UNIFORM, JITTER_EXPONENTIAL
+from .filters import BACKEND_REGEX, BACKEND_AHO_CORASICK
+from .exporter import add_export_arguments, run_export
+from .search import Search
 
+COMMANDS = ("scrape", "search", "export", "stats", "vacuum")
 
-def setup_logging(file_path: str) -> logging.Logger:
+
+def load_searches(args: argparse.Namespace, parser: argparse.ArgumentParser) -> List[Search]:
     """
-    Sets up & returns a logger with handlers for both the console 
-    and the file in `file_path`
+    Returns the searches given by the repeated `--job_search`/`--location` flags
+    followed by the ones in `--search_file`, one `job search | location` per line
     """
+    job_searches = args.job_search or []
+    locations = args.location or []
 
-    # Creates log directory if it doesn't exist
-    log_dir = os.path.dirname(file_path)
-    os.makedirs(log_dir, exist_ok=True)
+    # A single location applies to every job search
+    if len(locations) == 1:
+        locations = locations * len(job_searches)
 
-    # Initiate logger
-    logger = logging.getLogger(__name__)
-    logger.setLevel(logging.DEBUG)
+    if len(job_searches) != len(locations):
+        parser.error("each --job_search needs a matching --location (or a single --location for all)")
 
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.DEBUG)
-    formatter_c = logging.Formatter('%(levelname)s - %(message)s')
-    console_handler.setFormatter(formatter_c)
-    logger.addHandler(console_handler)
+    searches = [Search(job_search, location) for job_search, location in zip(job_searches, locations)]
 
-    # File handler
-    try:
-        file_handler = logging.FileHandler(file_path)
-        file_handler.setLevel(logging.ERROR) # Log only errors in file
-        formatter_f = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s\n')
-        file_handler.setFormatter(formatter_f)
-        logger.addHandler(file_handler)
-    except Exception as e:
-        logger.warning(f'Error creating logger file handler: {e}')
+    if args.search_file:
+        with open(args.search_file) as search_file:
+            for line_num, line in enumerate(search_file, start=1):
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
 
-    return logger
+                if '|' not in line:
+                    parser.error(f"{args.search_file}:{line_num}: expected 'job search | location'")
 
+                job_search, location = (part.strip() for part in line.split('|', 1))
+                searches.append(Search(job_search, location))
 
-async def main():
-    load_dotenv()
+    if not searches:
+        parser.error("at least one search is required, use --job_search/--location or --search_file")
+
+    return list(dict.fromkeys(searches))
+
+
+def add_logging_arguments(parser: argparse.ArgumentParser, default_level: str) -> None:
+    parser.add_argument("--log_level", choices=["DEBUG", "INFO", "WARNING", "ERROR"], default=default_level,
+                        type=str.upper, help=f"Lowest level of the messages shown on the console (default {default_level})")
+    parser.add_argument("--json_log", metavar="PATH",
+                        help="Also log compact JSON lines into PATH, or '-' to print them instead of the console text")
+
+
+def add_scrape_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Adds the arguments of the `scrape` command to `parser`
+    """
+    parser.add_argument("-s", "--job_search", action="append", help="Search by title, skill, or company (repeatable)")
+    parser.add_argument("-l", "--location", action="append", help="City, state, or zip code (repeatable)")
+    parser.add_argument("-f", "--search_file", help="File with one 'job search | location' per line")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Number of searches to run concurrently")
+    parser.add_argument("--detail_workers", type=int, default=0,
+                        help="Number of pages opening new jobs to store their description, seniority & applicants")
+    parser.add_argument("--shards", type=int, default=1,
+                        help="Number of Chrome instances, each in its own process, to split the searches across")
+    parser.add_argument("--warm_browser", action="store_true",
+                        help="Attach to a long-lived Chrome, launching it if needed, and leave it running afterwards")
+    parser.add_argument("--keep_browser_warm", action="store_true",
+                        help="Don't scrape, keep a warm Chrome running and relaunch it whenever it dies")
+    parser.add_argument("--api_cards", action="store_true",
+                        help="Read the job cards from the search results API responses, falling back to the page")
+    parser.add_argument("--filter_backend", choices=[BACKEND_REGEX, BACKEND_AHO_CORASICK], default=BACKEND_REGEX,
+                        help="Matcher of the blocklist & allowlist terms, aho-corasick needs pyahocorasick (default regex)")
+    parser.add_argument("--filter_ignore_case", action="store_true",
+                        help="Match the blocklist & allowlist terms regardless of case")
+    parser.add_argument("--filter_word_boundaries", action="store_true",
+                        help="Only match the blocklist & allowlist terms as whole words, not inside other words")
+    parser.add_argument("--recycle_pages", type=int, default=0,
+                        help="Replace every search's page with a fresh one after this many results pages")
+    parser.add_argument("--js_heap_limit_mb", type=int, default=0,
+                        help="Replace a search's page once its JS heap grows past this many MB")
+    parser.add_argument("--rss_limit_mb", type=int, default=0,
+                        help="Replace a search's page once the scraper's resident memory grows past this many MB")
+    parser.add_argument("--cache_known_jobs", action="store_true",
+                        help="Load every stored job id into memory at startup for duplicate checks")
+    parser.add_argument("--url_pagination", action="store_true",
+                        help="Load every results page directly by its URL instead of the search form & pagination buttons")
+    parser.add_argument("--start_page", type=int, default=1,
+                        help="Results page to start every search at, instead of resuming from its checkpoint")
+    parser.add_argument("--fresh", action="store_true",
+                        help="Ignore the checkpoints of unfinished searches and crawl them from the start")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Sort results by most recent and stop a search once its pages are only known jobs")
+    parser.add_argument("--stale_pages", type=int, default=1,
+                        help="Stale pages in a row that stop an incremental search (default 1)")
+    parser.add_argument("--stale_fraction", type=float, default=1.0,
+                        help="Fraction of known jobs that makes a page stale (default 1.0)")
+    parser.add_argument("--wait_mode", choices=[WAIT_MODE_RANDOM, WAIT_MODE_CONDITION], default=WAIT_MODE_RANDOM,
+                        help="Sleep a random time after every action, or wait for the page to update (default random)")
+    parser.add_argument("--jitter_min", type=float, default=0.5,
+                        help="Minimum seconds of human-like jitter after every action in the condition wait mode")
+    parser.add_argument("--jitter_max", type=float, default=1.5,
+                        help="Maximum seconds of human-like jitter after every action in the condition wait mode")
+    parser.add_argument("--rate", type=float,
+                        help="Maximum navigations & clicks per second, shared by every worker (default unlimited)")
+    parser.add_argument("--burst", type=int, default=3, help="Requests allowed back to back before --rate applies")
+    parser.add_argument("--rate_jitter", choices=[JITTER_NONE, JITTER_UNIFORM, JITTER_EXPONENTIAL],
+                        default=JITTER_UNIFORM, help="Distribution of the random delay added to every request")
+    parser.add_argument("--rate_jitter_scale", type=float, default=0.5,
+                        help="Mean seconds of the random delay added to every request")
+    parser.add_argument("--rate_state_file", metavar="PATH",
+                        help="Share the rate limit with every process using the same file, such as other shards")
+    parser.add_argument("--metrics_report", metavar="PATH",
+                        help="Write a JSON report of the time spent per operation & search to PATH")
+    parser.add_argument("--prometheus_file", metavar="PATH",
+                        help="Write the same timings as a Prometheus textfile-collector file to PATH")
+    parser.add_argument("--block_resources", action="store_true",
+                        help="Abort images, fonts, media & tracking requests the scraper doesn't need")
+
+    session = parser.add_mutually_exclusive_group()
+    session.add_argument("--record", metavar="DIR", help="Record the responses of the session into DIR")
+    session.add_argument("--replay", metavar="DIR",
+                         help="Replay a session recorded into DIR in a headless browser, without network or waits")
+    add_logging_arguments(parser, "DEBUG")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Returns the parser of the command line, with a subparser per command
+    """
     parser = argparse.ArgumentParser(description="Playwright job scraper")
-    parser.add_argument("-s", "--job_search", required=True, help="Search by title, skill, or company")
-    parser.add_argument("-l", "--location", required=True, help="City, state, or zip code")
-    args = parser.parse_args()
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+
+    scrape = commands.add_parser("scrape", help="Scrape job searches into the database (the default command)")
+    add_scrape_arguments(scrape)
+
+    search = commands.add_parser("search", help="Search the stored jobs")
+    search.add_argument("term", help="Terms to match in the title, company, location or remote status, "
+                                     "\"quoted phrases\" and prefix* terms are supported")
+    search.add_argument("--limit", type=int, default=50, help="Maximum jobs to show (default 50)")
+    search.add_argument("--offset", type=int, default=0, help="Jobs to skip, to page through the results")
+    search.add_argument("--json", action="store_true", help="Print every column of the jobs as JSON lines")
+    add_logging_arguments(search, "WARNING")
+
+    export = commands.add_parser("export", help="Stream the stored jobs into a JSONL, CSV or Parquet file")
+    add_export_arguments(export)
+    add_logging_arguments(export, "INFO")
+
+    stats = commands.add_parser("stats", help="Print a JSON summary of the stored jobs, employers & searches")
+    add_logging_arguments(stats, "WARNING")
+
+    vacuum = commands.add_parser("vacuum", help="Compact the database and refresh its query statistics")
+    add_logging_arguments(vacuum, "INFO")
+
+    return parser
+
+
+def resolve_scrape_args(args: argparse.Namespace, parser: argparse.ArgumentParser) -> argparse.Namespace:
+    """
+    Resolves the searches to run of parsed `scrape` arguments
+    """
+    args.searches = [] if args.keep_browser_warm else load_searches(args, parser)
+    args.cdp_url = None
+    args.chrome_profile_path = None
+    args.shard = None
+    return args
 
-    logger = setup_logging(os.getenv('LOGGING_PATH'))
+
+def parse_args(parser: argparse.ArgumentParser, argv: List[str] = None) -> argparse.Namespace:
+    """
+    Parses the command line arguments. Without a command, they are the
+    arguments of `scrape`, like before commands existed
+    """
+    argv = sys.argv[1:] if argv is None else argv
+
+    if not argv or argv[0] not in COMMANDS + ("-h", "--help"):
+        argv = ["scrape"] + argv
+
+    args = parser.parse_args(argv)
+
+    if args.command == "scrape":
+        resolve_scrape_args(args, parser)
+
+    return args
+
+
+async def run_scrape(args: argparse.Namespace, logger: logging.Logger) -> None:
+    # The scraper, and Playwright with it, is only imported once the `scrape` arguments
+    # are valid, so the other commands start fast and never touch Chrome
+    from .job_scraper import JobScraper
+    from .browser_manager import BrowserManager
+    from .sharding import run_sharded
+
+    if args.keep_browser_warm:
+        await BrowserManager(logger, warm=True).keep_warm()
+        return
+
+    if args.shards > 1:
+        profile_path = BrowserManager(logger).get_chrome_profile_path()
+        run_sharded(args, logger, profile_path)
+        return
 
     scraper = JobScraper(args, logger)
     await scraper.run()
 
+
+def run_database_command(args: argparse.Namespace, logger: logging.Logger) -> None:
+    """
+    Runs the `search`, `stats` or `vacuum` command, which only need the database
+    """
+    from .database_manager import DatabaseManager
+
+    database_manager = DatabaseManager(logger)
+
+    try:
+        if args.command == "search":
+            columns = list(database_manager.get_column_types('jobs'))
+
+            for row in database_manager.search_jobs(args.term, max(1, args.limit), max(0, args.offset)):
+                job = dict(zip(columns, row))
+
+                if args.json:
+                    print(json.dumps(job, ensure_ascii=False))
+                else:
+                    print(" | ".join(str(job[column] or '') for column in
+                                     ("jobid", "title", "company", "location", "remote_status", "linkedin_url")))
+
+        elif args.command == "stats":
+            print(json.dumps(database_manager.get_stats(), indent=2, ensure_ascii=False))
+
+        elif args.command == "vacuum":
+            size_before, size_after = database_manager.vacuum()
+            logger.info(f"🧹 Vacuumed database from {size_before / 1024 / 1024:.1f}MB to {size_after / 1024 / 1024:.1f}MB")
+    finally:
+        database_manager.close()
+
+
+async def main():
+    load_dotenv()
+    args = parse_args(build_parser())
+
+    logger = setup_logging(os.getenv('LOGGING_PATH'), args.log_level, args.json_log)
+
+    if args.command == "scrape":
+        await run_scrape(args, logger)
+    elif args.command == "export":
+        run_export(args, logger)
+    else:
+        run_database_command(args, logger)
+
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,164 @@
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple, Union
+
+
+# Upper bounds, in seconds, of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Time spent doing the scraping work, such as navigating, reading elements or writing to the DB
+WORK = 'work'
+
+# Time deliberately spent sleeping, such as random waits
+WAIT = 'wait'
+
+PROMETHEUS_METRIC = 'linkedin_scraper_operation_seconds'
+
+
+class OperationStats:
+    """Count, total time & latency histogram of one operation"""
+
+    count: int
+    total: float
+    max: float
+    buckets: List[int]
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.buckets[next((i for i, bound in enumerate(LATENCY_BUCKETS) if seconds <= bound), -1)] += 1
+
+
+    def merge(self, other: 'OperationStats') -> None:
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "total_seconds": round(self.total, 6),
+            "mean_seconds": round(self.total / self.count, 6) if self.count else 0,
+            "max_seconds": round(self.max, 6),
+            "histogram": {str(bound): count for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), self.buckets)},
+        }
+
+
+class Metrics:
+    """
+    Thread-safe timings of every scraper operation, per kind (`WORK` or
+    `WAIT`) and per search, reported as JSON or as a Prometheus textfile.
+    The reports of a shard process are labelled with its `shard`
+    """
+
+    operations: Dict[Tuple[str, str, str], OperationStats]
+    started_at: float
+    lock: threading.Lock
+    shard: Union[int, None]
+
+    def __init__(self, shard: int = None):
+        self.shard = shard
+        self.operations = {}
+        self.started_at = time.perf_counter()
+        self.lock = threading.Lock()
+
+
+    def observe(self, operation: str, seconds: float, search: str = '', kind: str = WORK) -> None:
+        with self.lock:
+            key = (kind, operation, search or '')
+            if key not in self.operations:
+                self.operations[key] = OperationStats()
+            self.operations[key].observe(seconds)
+
+
+    @contextmanager
+    def timer(self, operation: str, search: str = '', kind: str = WORK) -> Iterator[None]:
+        """Times the body of the `with` block as one `operation`"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(operation, time.perf_counter() - start, search, kind)
+
+
+    def report(self) -> Dict:
+        """
+        Returns the timings of every operation, over the whole run and per search
+        """
+        with self.lock:
+            operations = list(self.operations.items())
+
+        totals = {WORK: {}, WAIT: {}}
+        by_search = {}
+
+        for (kind, operation, search), stats in operations:
+            total = totals[kind].setdefault(operation, OperationStats())
+            total.merge(stats)
+
+            if search:
+                search_kinds = by_search.setdefault(search, {WORK: {}, WAIT: {}})
+                search_kinds[kind][operation] = stats.to_dict()
+
+        return {
+            "shard": self.shard,
+            "wall_seconds": round(time.perf_counter() - self.started_at, 3),
+            "work_seconds": round(sum(stats.total for stats in totals[WORK].values()), 3),
+            "wait_seconds": round(sum(stats.total for stats in totals[WAIT].values()), 3),
+            WORK: {operation: stats.to_dict() for operation, stats in sorted(totals[WORK].items())},
+            WAIT: {operation: stats.to_dict() for operation, stats in sorted(totals[WAIT].items())},
+            "by_search": by_search,
+        }
+
+
+    def write_json(self, path: str) -> None:
+        with open(path, 'w') as report_file:
+            json.dump(self.report(), report_file, indent=2)
+
+
+    def write_prometheus(self, path: str) -> None:
+        """
+        Writes the timings as histograms in the Prometheus text format, for the
+        node exporter's textfile collector. The file is replaced atomically
+        """
+        with self.lock:
+            operations = sorted(self.operations.items())
+
+        lines = [
+            f"# HELP {PROMETHEUS_METRIC} Time spent per scraper operation, deliberate waits have kind=\"wait\"",
+            f"# TYPE {PROMETHEUS_METRIC} histogram",
+        ]
+
+        for (kind, operation, search), stats in operations:
+            labels = f'kind="{escape_label(kind)}",operation="{escape_label(operation)}",search="{escape_label(search)}"'
+            if self.shard is not None:
+                labels += f',shard="{self.shard}"'
+
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), stats.buckets):
+                cumulative += count
+                lines.append(f'{PROMETHEUS_METRIC}_bucket{{{labels},le="{bound}"}} {cumulative}')
+
+            lines.append(f'{PROMETHEUS_METRIC}_sum{{{labels}}} {stats.total}')
+            lines.append(f'{PROMETHEUS_METRIC}_count{{{labels}}} {stats.count}')
+
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w') as prometheus_file:
+            prometheus_file.write('\n'.join(lines) + '\n')
+        os.replace(temp_path, path)
+
+
+def escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
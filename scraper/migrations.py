@@ -0,0 +1,198 @@
+import logging
+import sqlite3
+from datetime import datetime, timezone
+from typing import Callable, List, Tuple
+
+
+# Columns added to `jobs` after its creation, filled in by the job detail workers
+JOB_DETAIL_COLUMNS = (
+    ('description', 'TEXT'),
+    ('seniority_level', 'TEXT'),
+    ('applicant_count', 'INTEGER'),
+    ('details_scraped_at', 'TEXT'),
+)
+
+# Columns added to `jobs` by the normalized schema
+JOB_TRACKING_COLUMNS = (
+    ('company_id', 'INTEGER REFERENCES employers (id)'),
+    ('first_seen', 'TEXT'),
+    ('last_seen', 'TEXT'),
+)
+
+
+def add_missing_columns(cursor: sqlite3.Cursor, table: str, columns: Tuple[Tuple[str, str], ...]) -> None:
+    """
+    Adds the `(name, type)` columns missing from `table`, for databases
+    created before those columns existed
+    """
+    cursor.execute(f'PRAGMA table_info({table})')
+    existing_columns = {row[1] for row in cursor.fetchall()}
+
+    for name, column_type in columns:
+        if name not in existing_columns:
+            cursor.execute(f'ALTER TABLE {table} ADD COLUMN {name} {column_type}')
+
+
+def create_base_schema(cursor: sqlite3.Cursor) -> None:
+    """
+    The schema from before migrations existed, so databases created back
+    then are brought up to it instead of failing on existing tables
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            jobid TEXT UNIQUE,
+            title TEXT,
+            company TEXT,
+            location TEXT,
+            remote_status TEXT,
+            linkedin_url TEXT
+        );
+    ''')
+    add_missing_columns(cursor, 'jobs', JOB_DETAIL_COLUMNS)
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS employers (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            company TEXT UNIQUE,
+            state TEXT
+        );
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS crawl_state (
+            search_key TEXT PRIMARY KEY,
+            last_page INTEGER NOT NULL DEFAULT 0,
+            cursor TEXT,
+            status TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        );
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS search_runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            search_key TEXT NOT NULL,
+            started_at TEXT NOT NULL,
+            finished_at TEXT NOT NULL,
+            pages INTEGER NOT NULL,
+            cards INTEGER NOT NULL,
+            new_jobs INTEGER NOT NULL,
+            stop_reason TEXT NOT NULL
+        );
+    ''')
+
+
+def normalize_jobs(cursor: sqlite3.Cursor) -> None:
+    """
+    Links every job to its employer, tracks when jobs were first & last
+    seen and by which searches, and indexes the columns jobs are queried by
+    """
+    add_missing_columns(cursor, 'jobs', JOB_TRACKING_COLUMNS)
+
+    # Jobs stored before their employer, or without a `STATE` to store it with, get one now
+    cursor.execute('''
+        INSERT OR IGNORE INTO employers (company)
+        SELECT DISTINCT company FROM jobs WHERE company IS NOT NULL
+    ''')
+    cursor.execute('''
+        UPDATE jobs SET company_id = (SELECT id FROM employers WHERE employers.company = jobs.company)
+        WHERE company_id IS NULL
+    ''')
+
+    # When existing jobs were first seen wasn't recorded, so it's the upgrade time
+    now = datetime.now(timezone.utc).isoformat()
+    cursor.execute('''
+        UPDATE jobs SET first_seen = COALESCE(first_seen, ?), last_seen = COALESCE(last_seen, ?)
+    ''', (now, now))
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS job_searches (
+            jobid TEXT NOT NULL REFERENCES jobs (jobid),
+            search_key TEXT NOT NULL,
+            first_seen TEXT NOT NULL,
+            last_seen TEXT NOT NULL,
+            PRIMARY KEY (jobid, search_key)
+        ) WITHOUT ROWID;
+    ''')
+
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_job_searches_search_key ON job_searches (search_key)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_jobs_company_id ON jobs (company_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_jobs_location ON jobs (location)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_jobs_remote_status ON jobs (remote_status)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_jobs_first_seen ON jobs (first_seen)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_jobs_last_seen ON jobs (last_seen)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_search_runs_search_key ON search_runs (search_key, started_at)')
+
+    # Recreated by `DatabaseManager.setup_search_index` to only fire when a searchable
+    # column changes, instead of on every `last_seen` update
+    cursor.execute('DROP TRIGGER IF EXISTS jobs_fts_update')
+
+
+def create_export_watermarks(cursor: sqlite3.Cursor) -> None:
+    """
+    Tracks the last `jobs.id` of every incremental export
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS export_watermarks (
+            name TEXT PRIMARY KEY,
+            last_id INTEGER NOT NULL,
+            exported_at TEXT NOT NULL
+        );
+    ''')
+
+
+# Every migration brings the schema from the version before it to its own,
+# its position in the list. Append new ones, never edit or reorder applied ones
+MIGRATIONS: List[Tuple[str, Callable[[sqlite3.Cursor], None]]] = [
+    ('base schema', create_base_schema),
+    ('normalized jobs', normalize_jobs),
+    ('export watermarks', create_export_watermarks),
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def get_schema_version(cursor: sqlite3.Cursor) -> int:
+    cursor.execute('PRAGMA user_version')
+    return cursor.fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection, logger: logging.Logger) -> int:
+    """
+    Applies the migrations the database at `conn` hasn't had yet, each in its
+    own transaction along with the bump of its `PRAGMA user_version`, so a
+    failed migration leaves the schema at the previous version. Returns the
+    resulting schema version
+    """
+    cursor = conn.cursor()
+    conn.commit()
+
+    for version, (name, migration) in enumerate(MIGRATIONS, start=1):
+        if get_schema_version(cursor) >= version:
+            continue
+
+        try:
+            # Takes the write lock up front, so shards starting together migrate one at a time
+            cursor.execute('BEGIN IMMEDIATE')
+
+            # Another process may have applied it while this one waited for the lock
+            if get_schema_version(cursor) >= version:
+                conn.rollback()
+                continue
+
+            migration(cursor)
+            cursor.execute(f'PRAGMA user_version = {version}')
+            conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            logger.critical(f"❌ Database migration {version} ({name}) failed: {e}")
+            raise e
+
+        logger.info(f"✅ Migrated database to version {version}: {name}")
+
+    version = get_schema_version(cursor)
+    if version > SCHEMA_VERSION:
+        logger.warning(f"⚠️ Database schema version {version} is newer than this scraper's {SCHEMA_VERSION}")
+
+    return version
@@ -1,133 +1,468 @@
+import re
 import logging
 import math
 import random
 import asyncio
-from typing import Union, List
-from playwright.async_api import Page, Locator
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Awaitable, Callable, ContextManager, Union, List, Dict, Tuple
+from .metrics import Metrics, WORK, WAIT
+from .rate_limiter import RateLimiter
+
+# Only needed for annotations, so the parsers below can be used without Playwright installed
+if TYPE_CHECKING:
+    from playwright.async_api import Page, Locator
+
+# Seconds a smooth scroll is given to settle
+SCROLL_SETTLE_TIME = 1.5
+
+# Sleeps a random amount of time after every action
+WAIT_MODE_RANDOM = 'random'
+
+# Waits for the page to reach a concrete condition after every action,
+# followed by a short human-like jitter
+WAIT_MODE_CONDITION = 'condition'
+
+# Milliseconds to wait for a condition before moving on anyway
+CONDITION_TIMEOUT = 15000
+
+# Milliseconds without network requests that count as the network being quiet
+NETWORK_QUIET_TIMEOUT = 5000
+
+# URL parts of the pages LinkedIn shows instead of the requested one when it suspects a bot
+CHALLENGE_URL_PATTERNS = ("/checkpoint/", "/authwall", "/uas/login")
+
+
+# Reads every job card matched by `cards` in a single round-trip
+EXTRACT_JOB_CARDS_JS = """
+(selectors) => Array.from(document.querySelectorAll(selectors.cards)).map((card) => {
+    const text = (selector) => {
+        const element = card.querySelector(selector);
+        return element ? element.textContent.trim() : '';
+    };
+
+    return {
+        jobid: card.getAttribute('data-job-id'),
+        title: text(selectors.title),
+        company: text(selectors.company),
+        location_raw: text(selectors.location),
+    };
+})
+"""
+
+
+# Reads the description & top card texts of a job page in a single round-trip
+EXTRACT_JOB_DETAILS_JS = """
+(selectors) => {
+    const text = (selector) => Array.from(document.querySelectorAll(selector))
+        .map((element) => element.innerText.trim())
+        .join('\\n');
+
+    return {
+        description: text(selectors.description),
+        insights: text(selectors.insights),
+        top_card: text(selectors.top_card),
+    };
+}
+"""
+
+SENIORITY_LEVELS = ("Internship", "Entry level", "Associate", "Mid-Senior level", "Director", "Executive")
+
+APPLICANT_COUNT_PATTERN = re.compile(r'(\d[\d,]*)\s+(?:applicants|people clicked apply)', re.IGNORECASE)
+
+
+def parse_location(location_string: str) -> Tuple[str, str]:
+    """
+    Splits a card location such as `Miami, FL (Remote)` into its
+    location and remote status
+    """
+    if ' (' not in location_string:
+        return location_string, ''
+
+    location, remote_status = location_string.split(' (')[:2]
+    return location, remote_status.replace(')', '')
+
+
+def parse_seniority_level(insights: str) -> str:
+    """
+    Returns the seniority level, such as `Mid-Senior level`, found in the
+    top card insights of a job page
+    """
+    return next((level for level in SENIORITY_LEVELS if level.lower() in insights.lower()), '')
+
+
+def parse_applicant_count(top_card: str) -> Union[int, None]:
+    """
+    Returns the applicant count, such as `45` for `Miami, FL · 45 applicants`,
+    found in the top card of a job page
+    """
+    match = APPLICANT_COUNT_PATTERN.search(top_card)
+    return int(match.group(1).replace(',', '')) if match else None
+
 
 class PageHandler:
     """Handles all `url` navigation and `page` interactions"""
 
-    page: Page
+    page: 'Page'
     logger: logging.Logger
+    wait_scale: float
+    metrics: Metrics
+    search: str
+    wait_mode: str
+    jitter_min: float
+    jitter_max: float
+    rate_limiter: RateLimiter
 
-    def __init__(self, page: Page, logger: logging.Logger):
+    def __init__(self, page: 'Page', logger: logging.Logger, wait_scale: float = 1.0,
+                 metrics: Metrics = None, search: str = '', wait_mode: str = WAIT_MODE_RANDOM,
+                 jitter_min: float = 0.5, jitter_max: float = 1.5, rate_limiter: RateLimiter = None):
+        """
+        `wait_scale` multiplies every wait, `0` disables them when replaying
+        a recorded session. Operations are timed into `metrics`, labeled with
+        `search`, when given. In the `condition` wait mode actions wait for
+        the page to update, then for a `jitter_min`-`jitter_max` seconds floor.
+        Every navigation & click first acquires a token from `rate_limiter`, if set
+        """
         self.page = page
         self.logger = logger
+        self.wait_scale = wait_scale
+        self.metrics = metrics
+        self.search = search
+        self.wait_mode = wait_mode
+        self.jitter_min = jitter_min
+        self.jitter_max = jitter_max
+        self.rate_limiter = rate_limiter
+
+
+    def timed(self, operation: str, kind: str = WORK) -> ContextManager:
+        """Times the body of the `with` block into `metrics`, if set"""
+
+        if not self.metrics:
+            return nullcontext()
 
+        return self.metrics.timer(operation, self.search, kind)
 
-    async def go_to_url(self, url: str, wait_min: int = 3, wait_max: int = 7) -> None:
-        """Navigate to the input `url`"""
 
-        self.logger.info(f"Goto URL: {url}")
-        await self.page.goto(url, wait_until="domcontentloaded")
-        await self.random_wait(wait_min, wait_max)
+    async def acquire_rate_limit(self, name: str) -> None:
+        """Waits for the shared rate limiter to allow the next request, if set"""
+
+        if self.rate_limiter:
+            with self.timed('rate_limit', WAIT):
+                await self.rate_limiter.acquire(name)
+
+
+    async def check_for_challenge(self) -> bool:
+        """
+        Returns if the page was redirected to a challenge or login page,
+        lowering the shared request rate if so
+        """
+        is_challenge = any(pattern in self.page.url for pattern in CHALLENGE_URL_PATTERNS)
+
+        if is_challenge and self.rate_limiter:
+            await self.rate_limiter.penalize(f"Challenge page {self.page.url}")
+
+        return is_challenge
+
+
+    async def go_to_url(self, url: str, wait_min: int = 3, wait_max: int = 7,
+                        wait_for_selector: str = None) -> None:
+        """
+        Navigate to the input `url`. In the `condition` wait mode, waits for
+        `wait_for_selector` to show up, or for the network to go quiet
+        """
+
+        self.logger.info("Goto URL: %s", url)
+        await self.acquire_rate_limit(url)
+
+        with self.timed('go_to_url'):
+            await self.page.goto(url, wait_until="domcontentloaded")
+
+        await self.check_for_challenge()
+
+        if wait_for_selector:
+            await self.settle(wait_min, wait_max, lambda: self.wait_for_selector(wait_for_selector))
+        else:
+            await self.settle(wait_min, wait_max)
+
+
+    async def settle(self, wait_min: int, wait_max: int,
+                     wait_for: Callable[[], Awaitable[None]] = None) -> None:
+        """
+        Waits after an action. In the `random` wait mode sleeps between
+        `wait_min` & `wait_max` seconds, in the `condition` wait mode awaits
+        `wait_for`, or a quiet network, then the jitter floor
+        """
+        if self.wait_mode != WAIT_MODE_CONDITION:
+            await self.random_wait(wait_min, wait_max)
+            return
+
+        await (wait_for or self.wait_for_network_quiet)()
+        await self.human_jitter()
+
+
+    async def human_jitter(self) -> None:
+        """Waits a random amount of time between `jitter_min` & `jitter_max` seconds"""
+
+        with self.timed('jitter', WAIT):
+            await asyncio.sleep(random.uniform(self.jitter_min, self.jitter_max) * self.wait_scale)
+
+
+    async def wait_for_network_quiet(self, timeout: int = NETWORK_QUIET_TIMEOUT) -> None:
+        """Waits until the page has had no network requests for a moment"""
+
+        try:
+            with self.timed('wait_for_network_quiet'):
+                await self.page.wait_for_load_state("networkidle", timeout=timeout)
+        except Exception:
+            self.logger.debug("Network didn't go quiet, moving on")
+
+
+    async def wait_for_selector(self, selector: str, timeout: int = CONDITION_TIMEOUT) -> None:
+        """Waits until an element matches `selector`"""
+
+        try:
+            with self.timed('wait_for_selector'):
+                await self.page.wait_for_selector(selector, state="attached", timeout=timeout)
+        except Exception as e:
+            self.logger.warning(f"wait_for_selector() Gave up waiting for {selector}: {e}")
+
+
+    async def wait_for_job_details(self, jobid: str, timeout: int = CONDITION_TIMEOUT) -> None:
+        """Waits until the job details pane shows the job `jobid`"""
+
+        try:
+            with self.timed('wait_for_job_details'):
+                await self.page.wait_for_function("""
+                (jobid) => new URL(window.location.href).searchParams.get('currentJobId') === jobid
+                """, arg=jobid, timeout=timeout)
+        except Exception as e:
+            self.logger.warning(f"wait_for_job_details() Gave up waiting for job {jobid}: {e}")
+
+
+    async def wait_for_cards_rerender(self, cards_selector: str, previous_jobid: str,
+                                      timeout: int = CONDITION_TIMEOUT) -> None:
+        """
+        Waits until the card list is rendered again, with a first card other
+        than the `previous_jobid` one
+        """
+        try:
+            with self.timed('wait_for_cards_rerender'):
+                await self.page.wait_for_function("""
+                ([cardsSelector, previousJobid]) => {
+                    const card = document.querySelector(cardsSelector);
+                    return card !== null && card.getAttribute('data-job-id') !== previousJobid;
+                }
+                """, arg=[cards_selector, previous_jobid], timeout=timeout)
+        except Exception as e:
+            self.logger.warning(f"wait_for_cards_rerender() Gave up waiting for new cards: {e}")
+
+
+    async def get_first_jobid(self, cards_selector: str) -> Union[str, None]:
+        """
+        Returns the job id of the first card matched by `cards_selector`, or
+        `None` without cards. Unlike most helpers it raises on errors, such as
+        a closed page, so they aren't mistaken for the end of the results
+        """
+        with self.timed('get_first_jobid'):
+            return await self.page.evaluate("""
+            (cardsSelector) => {
+                const card = document.querySelector(cardsSelector);
+                return card === null ? null : card.getAttribute('data-job-id');
+            }
+            """, cards_selector)
 
 
     async def random_wait(self, wait_min: int = 5, wait_max: int = 12) -> None:
         """Waits for a random amount of time between `wait_min` & `wait_max`"""
 
         wait_time = math.floor(random.random() * (wait_max - wait_min + 1)) + wait_min
-        await asyncio.sleep(wait_time)
+
+        with self.timed('random_wait', WAIT):
+            await asyncio.sleep(wait_time * self.wait_scale)
 
     
-    async def get_element_text(self, target: Union[str, Locator]) -> Union[str, None]:
+    async def get_element_text(self, target: Union[str, 'Locator']) -> Union[str, None]:
         """Returns the text contents of an `HTML` element"""
 
         try:
             text_content = ''
 
-            if isinstance(target, str):
-                text_content = await self.page.locator(target).text_content()
-            
-            text_content = await target.text_content()
+            with self.timed('get_element_text'):
+                if isinstance(target, str):
+                    text_content = await self.page.locator(target).text_content()
+                
+                text_content = await target.text_content()
+
             return text_content.strip()
         except Exception as error:
             self.logger.warning(f"Error finding element with selector {target}: {error}")
             return None
     
 
-    async def get_element_property(self, target: Union[str, Locator],
+    async def get_element_property(self, target: Union[str, 'Locator'],
                                    property: str) -> Union[str, None]:
         """Returns a `property` of an `HTML` element"""
 
         try:
-            if isinstance(target, str):
-                locator = self.page.locator(target)
-                return await locator.get_attribute(property)
-            
-            return await target.get_attribute(property)
+            with self.timed('get_element_property'):
+                if isinstance(target, str):
+                    locator = self.page.locator(target)
+                    return await locator.get_attribute(property)
+                
+                return await target.get_attribute(property)
         except Exception as e:
             self.logger.warning(f"get_element_property() Error occurred while getting element property: {e}")
             return None
 
 
-    async def click_and_wait(self, target: Union[str, Locator], name: str,
-                             wait_min: int = 2, wait_max: int = 4) -> None:
-        """Clicks target and waits before continuing"""
+    async def click_and_wait(self, target: Union[str, 'Locator'], name: str,
+                             wait_min: int = 2, wait_max: int = 4,
+                             wait_for: Callable[[], Awaitable[None]] = None) -> None:
+        """
+        Clicks target and waits before continuing, for `wait_for` in the
+        `condition` wait mode
+        """
 
         try:
-            if isinstance(target, str):
-                await self.page.locator(target).click()
-            else:
-                await target.click()
+            await self.acquire_rate_limit(name)
+
+            with self.timed('click'):
+                if isinstance(target, str):
+                    await self.page.locator(target).click()
+                else:
+                    await target.click()
+
+            await self.check_for_challenge()
             
-            self.logger.debug(f"Clicked Button {name}")
-            await self.random_wait(wait_min, wait_max)
+            self.logger.debug("Clicked Button %s", name)
+            await self.settle(wait_min, wait_max, wait_for)
         except Exception as e:
             self.logger.warning(f'click_and_wait() Error occurred clicking element: {e}')
 
 
-    async def fill_element(self, target: Union[str, Locator], value, name,
+    async def fill_element(self, target: Union[str, 'Locator'], value, name,
                            wait_min: int = 2, wait_max: int = 4) -> None:
         try:
             """Fills target with text value"""
 
-            if isinstance(target, str):
-                locator = self.page.locator(target)
-                await locator.fill(value)
-            else:
-                await target.fill(value)
+            with self.timed('fill_element'):
+                if isinstance(target, str):
+                    locator = self.page.locator(target)
+                    await locator.fill(value)
+                else:
+                    await target.fill(value)
             
-            self.logger.debug(f"Filled Element: {name}")
-            await self.random_wait(wait_min, wait_max)
+            self.logger.debug("Filled Element: %s", name)
+
+            # Filling an input doesn't update the page, only the jitter applies
+            if self.wait_mode == WAIT_MODE_CONDITION:
+                await self.human_jitter()
+            else:
+                await self.random_wait(wait_min, wait_max)
         except Exception as e:
             self.logger.warning(f"fill_element() Error trying to fill element {name}: {e}")
 
 
-    async def get_elements(self, selector: str) -> Union[List[Locator], None]:
+    async def get_elements(self, selector: str) -> Union[List['Locator'], None]:
         """Returns all elements matched by the `css selector`"""
 
         try:
-            return await self.page.locator(selector).all()
+            with self.timed('get_elements'):
+                return await self.page.locator(selector).all()
         except Exception as e:
             self.logger.warning(f'get_elements() Error getting elements: {e}')
             return None
     
     
-    async def scroll_element_into_view(self, target: Union[str, Locator], name,
+    async def scroll_element_into_view(self, target: Union[str, 'Locator'], name,
                                        wait_min: int = 2, wait_max: int = 4) -> None:
         """Scrolls the target element into view"""
         try:
-            # Convert Playwright Locator to an ElementHandle if necessary
             if isinstance(target, str):
-                element_handle = await self.page.locator(target).element_handle()
-            elif hasattr(target, "element_handle"):
-                element_handle = await target.element_handle()
-            else:
-                element_handle = target  
+                target = self.page.locator(target)
 
-            if element_handle:
-                await self.page.evaluate("""
-                async (element) => {
-                    element.scrollIntoView({ block: 'nearest', behavior: 'smooth' });
-                    await new Promise(resolve => setTimeout(resolve, 1500));
-                }
-                """, element_handle)
-                self.logger.debug(f"Scrolled Into View: {name}")
-            else:
+            with self.timed('scroll_element_into_view'):
+                # Scrolls instantly when waiting on conditions, there's no animation to wait out
+                behavior = 'instant' if self.wait_mode == WAIT_MODE_CONDITION else 'smooth'
+
+                # Evaluating on the Locator, rather than on an ElementHandle made from
+                # it, leaves no handle behind in the renderer to dispose of
+                if target:
+                    await target.evaluate("""
+                    (element, behavior) => element.scrollIntoView({ block: 'nearest', behavior })
+                    """, behavior)
+
+            if not target:
                 self.logger.warning(f"Failed to scroll to element {name}: Element not found.")
+            elif self.wait_mode == WAIT_MODE_CONDITION:
+                self.logger.debug("Scrolled Into View: %s", name)
+                await self.human_jitter()
+                return
+            else:
+                # Gives the smooth scroll time to finish
+                with self.timed('scroll_settle', WAIT):
+                    await asyncio.sleep(SCROLL_SETTLE_TIME * self.wait_scale)
+
+                self.logger.debug("Scrolled Into View: %s", name)
 
             await self.random_wait(wait_min, wait_max)
         except Exception as e:
             self.logger.warning(f'Error occurred scrolling element into view: {e}')
+
+
+    async def extract_job_cards(self, cards_selector: str, title_selector: str,
+                                company_selector: str, location_selector: str) -> Union[List[Dict[str, str]], None]:
+        """
+        Returns a record for every job card matched by `cards_selector`,
+        read with a single `page.evaluate` instead of one call per field.
+        Returns `None` when the extraction fails, and an empty list without cards
+        """
+        try:
+            with self.timed('extract_job_cards'):
+                cards = await self.page.evaluate(EXTRACT_JOB_CARDS_JS, {
+                    "cards": cards_selector,
+                    "title": title_selector,
+                    "company": company_selector,
+                    "location": location_selector,
+                })
+        except Exception as e:
+            self.logger.warning(f'extract_job_cards() Error extracting job cards: {e}')
+            return None
+
+        records = []
+        for card in cards:
+            location, remote_status = parse_location(card['location_raw'])
+            records.append({
+                "jobid": card['jobid'],
+                "title": card['title'],
+                "company": card['company'],
+                "location": location,
+                "location_raw": card['location_raw'],
+                "remote_status": remote_status,
+            })
+
+        self.logger.debug("Extracted %d Job Cards", len(records))
+        return records
+
+
+    async def extract_job_details(self, description_selector: str, insights_selector: str,
+                                  top_card_selector: str) -> Union[Dict[str, Union[str, int]], None]:
+        """
+        Returns the description, seniority level & applicant count of the
+        job page currently loaded, read with a single `page.evaluate`
+        """
+        try:
+            with self.timed('extract_job_details'):
+                details = await self.page.evaluate(EXTRACT_JOB_DETAILS_JS, {
+                    "description": description_selector,
+                    "insights": insights_selector,
+                    "top_card": top_card_selector,
+                })
+        except Exception as e:
+            self.logger.warning(f'extract_job_details() Error extracting job details: {e}')
+            return None
+
+        return {
+            "description": details['description'],
+            "seniority_level": parse_seniority_level(details['insights']),
+            "applicant_count": parse_applicant_count(details['top_card']),
+        }
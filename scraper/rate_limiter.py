@@ -0,0 +1,147 @@
+import os
+import json
+import time
+import random
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+JITTER_NONE = 'none'
+JITTER_UNIFORM = 'uniform'
+JITTER_EXPONENTIAL = 'exponential'
+
+# How much the rate drops when a challenge page or empty results show up...
+PENALTY_FACTOR = 0.5
+
+# ...and how much it recovers after every healthy results page
+RECOVERY_FACTOR = 1.1
+
+# The rate never adapts below this fraction of the configured rate
+MIN_RATE_FRACTION = 0.1
+
+# Seconds between attempts at the state file lock while another process holds it
+LOCK_RETRY_INTERVAL = 0.01
+
+
+class RateLimiter:
+    """
+    Token bucket every navigation & click acquires a token from before it
+    runs. Tokens refill at `rate` per second up to `burst`, and every
+    acquisition adds a random jitter. With a `state_file` the bucket is shared
+    by every process using that file, guarded by a file lock. The rate adapts
+    down on challenge pages & empty results and recovers on healthy pages
+    """
+
+    logger: logging.Logger
+    max_rate: float
+    burst: int
+    jitter: str
+    jitter_scale: float
+    state_file: str
+    state: Dict[str, float]
+    lock: asyncio.Lock
+
+    def __init__(self, logger: logging.Logger, rate: float, burst: int = 3,
+                 jitter: str = JITTER_UNIFORM, jitter_scale: float = 0.5, state_file: str = None):
+        self.logger = logger
+        self.max_rate = rate
+        self.burst = max(1, burst)
+        self.jitter = jitter
+        self.jitter_scale = jitter_scale
+        self.state_file = state_file
+        self.state = {"tokens": float(self.burst), "updated_at": time.time(), "rate": rate}
+        self.lock = asyncio.Lock()
+
+        if state_file and not fcntl:
+            self.logger.warning("File locks are unavailable, the rate limit won't be shared across processes")
+            self.state_file = None
+
+
+    async def acquire(self, name: str = '') -> None:
+        """
+        Takes a token, waiting until one is available, plus the jitter
+        """
+        async with self.lock:
+            async with self.shared_state() as state:
+                now = time.time()
+                state["tokens"] = min(self.burst, state["tokens"] + (now - state["updated_at"]) * state["rate"])
+                state["updated_at"] = now
+
+                # Takes the token right away, going into debt if the bucket is empty,
+                # so concurrent callers queue up behind each other
+                state["tokens"] -= 1
+                delay = max(0.0, -state["tokens"] / state["rate"])
+
+        delay += self.jitter_delay()
+        if delay:
+            self.logger.debug("Rate limited %s for %.2fs", name, delay)
+            await asyncio.sleep(delay)
+
+
+    def jitter_delay(self) -> float:
+        if self.jitter == JITTER_UNIFORM:
+            return random.uniform(0, 2 * self.jitter_scale)
+        if self.jitter == JITTER_EXPONENTIAL:
+            return random.expovariate(1 / self.jitter_scale) if self.jitter_scale > 0 else 0.0
+        return 0.0
+
+
+    async def penalize(self, reason: str) -> None:
+        """Lowers the rate after a sign of being throttled"""
+        async with self.lock:
+            async with self.shared_state() as state:
+                state["rate"] = max(self.max_rate * MIN_RATE_FRACTION, state["rate"] * PENALTY_FACTOR)
+                rate = state["rate"]
+
+        self.logger.warning(f"⚠️ {reason}, lowering request rate to {rate:.3f}/s")
+
+
+    async def reward(self) -> None:
+        """Recovers the rate towards the configured one after a healthy page"""
+        async with self.lock:
+            async with self.shared_state() as state:
+                state["rate"] = min(self.max_rate, state["rate"] * RECOVERY_FACTOR)
+
+
+    @asynccontextmanager
+    async def shared_state(self) -> AsyncIterator[Dict[str, float]]:
+        """
+        Yields the bucket state, loaded from & saved back to `state_file`
+        under an exclusive file lock when set. The lock is polled rather than
+        waited on, so another process holding it doesn't block the event loop
+        """
+        if not self.state_file:
+            yield self.state
+            return
+
+        with open(f"{self.state_file}.lock", "a") as lock_file:
+            while True:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    await asyncio.sleep(LOCK_RETRY_INTERVAL)
+
+            try:
+                try:
+                    with open(self.state_file) as state_file:
+                        self.state = json.load(state_file)
+                except (OSError, ValueError):
+                    # First process to use the file, or a torn write, starts a fresh bucket
+                    pass
+
+                yield self.state
+
+                temp_path = f"{self.state_file}.{os.getpid()}.tmp"
+                with open(temp_path, "w") as state_file:
+                    json.dump(self.state, state_file)
+                os.replace(temp_path, self.state_file)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
@@ -0,0 +1,99 @@
+import os
+import logging
+from typing import Dict, List
+from playwright.async_api import BrowserContext, Route
+
+
+# Resource types none of the `LOCATORS` depend on
+DEFAULT_BLOCKED_RESOURCE_TYPES = ["image", "media", "font"]
+
+# Tracking beacons & ad scripts loaded by every LinkedIn page
+DEFAULT_BLOCKED_URL_PATTERNS = [
+    "px.ads.linkedin.com",
+    "/li/track",
+    "/sensorCollect",
+    "/platform-telemetry",
+    "doubleclick.net",
+    "googletagmanager.com",
+    "google-analytics.com",
+    "bat.bing.com",
+]
+
+# Requests the job list needs to render, never blocked
+DEFAULT_ALLOWED_URL_PATTERNS = ["/voyager/api/"]
+
+# Blocked requests never download, so their size is estimated from the
+# typical size of each resource type
+ESTIMATED_BYTES_PER_TYPE = {
+    "image": 25_000,
+    "media": 500_000,
+    "font": 40_000,
+    "stylesheet": 30_000,
+    "script": 60_000,
+}
+ESTIMATED_BYTES_OTHER = 2_000
+
+
+def env_list(name: str, default: List[str]) -> List[str]:
+    """Returns the comma separated list in the env variable `name`, or `default` if unset"""
+    value = os.getenv(name)
+    if value is None:
+        return default
+
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+class RequestBlocker:
+    """
+    Aborts requests by resource type & URL pattern at the network layer,
+    unless they match an allowed URL pattern
+    """
+
+    logger: logging.Logger
+    blocked_resource_types: List[str]
+    blocked_url_patterns: List[str]
+    allowed_url_patterns: List[str]
+    blocked: Dict[str, int]
+    bytes_saved: int
+
+    def __init__(self, logger: logging.Logger):
+        self.logger = logger
+        self.blocked_resource_types = env_list('BLOCK_RESOURCE_TYPES', DEFAULT_BLOCKED_RESOURCE_TYPES)
+        self.blocked_url_patterns = env_list('BLOCK_URL_PATTERNS', DEFAULT_BLOCKED_URL_PATTERNS)
+        self.allowed_url_patterns = env_list('ALLOW_URL_PATTERNS', DEFAULT_ALLOWED_URL_PATTERNS)
+        self.blocked = {}
+        self.bytes_saved = 0
+
+
+    async def install(self, context: BrowserContext) -> None:
+        await context.route("**/*", self.handle_route)
+        self.logger.info(f"🚫 Blocking resource types {self.blocked_resource_types} & "
+                         f"{len(self.blocked_url_patterns)} URL patterns")
+
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        if any(pattern in url for pattern in self.allowed_url_patterns):
+            return False
+
+        return (resource_type in self.blocked_resource_types
+                or any(pattern in url for pattern in self.blocked_url_patterns))
+
+
+    async def handle_route(self, route: Route) -> None:
+        request = route.request
+        resource_type = request.resource_type
+
+        if not self.should_block(resource_type, request.url):
+            # Lets earlier routes, such as a session replay, handle the request
+            await route.fallback()
+            return
+
+        self.blocked[resource_type] = self.blocked.get(resource_type, 0) + 1
+        self.bytes_saved += ESTIMATED_BYTES_PER_TYPE.get(resource_type, ESTIMATED_BYTES_OTHER)
+        await route.abort("blockedbyclient")
+
+
+    def log_summary(self) -> None:
+        total = sum(self.blocked.values())
+        self.logger.info(f"🚫 Blocked {total} requests {self.blocked}, "
+                         f"saving an estimated {self.bytes_saved / 1_000_000:.1f} MB")
@@ -0,0 +1,37 @@
+import os
+from urllib.parse import urlencode
+from typing import NamedTuple
+
+# Number of job cards LinkedIn shows per results page
+JOBS_PER_PAGE = 25
+
+
+class Search(NamedTuple):
+    """A job search keyword and the location to search it in"""
+
+    job_search: str
+    location: str
+
+    def __str__(self) -> str:
+        return f"{self.job_search} - {self.location}"
+
+    @property
+    def key(self) -> str:
+        """Identifies the search in the database, regardless of case & padding"""
+        return f"{self.job_search.strip().lower()}|{self.location.strip().lower()}"
+
+
+def build_search_url(search: Search, pagination_page: int = 1, most_recent: bool = False) -> str:
+    """
+    Returns the URL of the `pagination_page` results page of `search`,
+    which loads it directly without filling the search form
+    """
+    params = {"keywords": search.job_search, "location": search.location}
+
+    if most_recent:
+        params["sortBy"] = "DD"
+
+    if pagination_page > 1:
+        params["start"] = (pagination_page - 1) * JOBS_PER_PAGE
+
+    return f"{os.getenv('JOB_SEARCH_BASE_URL')}?{urlencode(params)}"
@@ -0,0 +1,138 @@
+import os
+import json
+import hashlib
+import logging
+from typing import Dict, Set, Union
+from playwright.async_api import BrowserContext, Response, Route
+
+
+# Resource types needed to render the job search results offline
+RECORDED_RESOURCE_TYPES = {"document", "xhr", "fetch", "script", "stylesheet"}
+
+
+class SessionStore:
+    """
+    Stores the responses of a browsing session on disk, keyed by request
+    method & `url`. Every response is a `<key>.json` metadata file next to
+    a `<key>.body` file with its raw body
+    """
+
+    logger: logging.Logger
+    path: str
+
+    def __init__(self, path: str, logger: logging.Logger):
+        self.path = path
+        self.logger = logger
+        os.makedirs(path, exist_ok=True)
+
+
+    @staticmethod
+    def key(method: str, url: str) -> str:
+        return hashlib.sha1(f"{method} {url}".encode()).hexdigest()
+
+
+    def save(self, method: str, url: str, status: int, headers: Dict[str, str], body: bytes) -> None:
+        """Writes a response to the store, replacing any previous one for the same request"""
+
+        key = self.key(method, url)
+
+        with open(os.path.join(self.path, f"{key}.body"), "wb") as body_file:
+            body_file.write(body)
+
+        with open(os.path.join(self.path, f"{key}.json"), "w") as meta_file:
+            json.dump({"method": method, "url": url, "status": status, "headers": headers}, meta_file)
+
+
+    def load(self, method: str, url: str) -> Union[Dict, None]:
+        """Returns a stored response with its `body`, or `None` if it wasn't recorded"""
+
+        key = self.key(method, url)
+        meta_path = os.path.join(self.path, f"{key}.json")
+
+        if not os.path.exists(meta_path):
+            return None
+
+        with open(meta_path) as meta_file:
+            response = json.load(meta_file)
+
+        with open(os.path.join(self.path, f"{key}.body"), "rb") as body_file:
+            response["body"] = body_file.read()
+
+        return response
+
+
+class SessionRecorder:
+    """Records the responses of every page in a browser context into a `SessionStore`"""
+
+    store: SessionStore
+    logger: logging.Logger
+    resource_types: Set[str]
+    recorded: int
+
+    def __init__(self, store: SessionStore, logger: logging.Logger,
+                 resource_types: Set[str] = RECORDED_RESOURCE_TYPES):
+        self.store = store
+        self.logger = logger
+        self.resource_types = resource_types
+        self.recorded = 0
+
+
+    def attach(self, context: BrowserContext) -> None:
+        context.on("response", self.on_response)
+        self.logger.info(f"🔴 Recording session into {self.store.path}")
+
+
+    async def on_response(self, response: Response) -> None:
+        request = response.request
+        if request.resource_type not in self.resource_types:
+            return
+
+        try:
+            body = await response.body()
+        except Exception as e:
+            # Redirects and aborted requests have no body to record
+            self.logger.debug("Skipped recording %s: %s", response.url, e)
+            return
+
+        # The recorded body is already decoded, so its encoding & length headers no longer apply
+        headers = {name: value for name, value in response.headers.items()
+                   if name not in ("content-encoding", "content-length")}
+        self.store.save(request.method, response.url, response.status, headers, body)
+        self.recorded += 1
+
+
+class SessionReplayer:
+    """
+    Serves every request of a browser context from a `SessionStore`,
+    aborting the ones that weren't recorded
+    """
+
+    store: SessionStore
+    logger: logging.Logger
+    hits: int
+    misses: int
+
+    def __init__(self, store: SessionStore, logger: logging.Logger):
+        self.store = store
+        self.logger = logger
+        self.hits = 0
+        self.misses = 0
+
+
+    async def install(self, context: BrowserContext) -> None:
+        await context.route("**/*", self.handle_route)
+        self.logger.info(f"⏪ Replaying session from {self.store.path}")
+
+
+    async def handle_route(self, route: Route) -> None:
+        request = route.request
+        response = self.store.load(request.method, request.url)
+
+        if response is None:
+            self.misses += 1
+            self.logger.debug("Not recorded, aborting: %s %s", request.method, request.url)
+            await route.abort()
+            return
+
+        self.hits += 1
+        await route.fulfill(status=response["status"], headers=response["headers"], body=response["body"])
@@ -0,0 +1,115 @@
+import os
+import shutil
+import asyncio
+import logging
+import argparse
+import multiprocessing
+from typing import List
+from .search import Search
+from .log_setup import setup_logging
+
+# Left out of a shard's profile copy: Chrome's locks of the profile in use, and caches it rebuilds
+PROFILE_COPY_IGNORE = shutil.ignore_patterns(
+    'Singleton*', 'lockfile', 'LOCK', 'Cache', 'Code Cache', 'GPUCache', 'ShaderCache', 'GrShaderCache'
+)
+
+
+def shard_searches(searches: List[Search], shards: int) -> List[List[Search]]:
+    """
+    Splits `searches` round-robin into `shards` lists, dropping empty ones
+    """
+    return [searches[i::shards] for i in range(shards) if searches[i::shards]]
+
+
+def shard_cdp_url(cdp_url: str, shard: int) -> str:
+    """
+    Returns the CDP URL of `shard`, which listens `shard` ports above `cdp_url`
+    """
+    host, port = cdp_url.replace("http://", "").split(":")
+    return f"http://{host}:{int(port) + shard}"
+
+
+def shard_profile_path(profile_path: str, shard: int) -> str:
+    """
+    Returns the Chrome profile dir of `shard`. Chrome locks its profile dir, so
+    every shard after the first one gets its own `<profile_path>-shard<n>` copy
+    """
+    return profile_path if shard == 0 else f"{profile_path}-shard{shard}"
+
+
+def copy_shard_profile(profile_path: str, shard_path: str, logger: logging.Logger) -> None:
+    """
+    Copies the Chrome profile at `profile_path`, and the login it holds, into
+    a shard's profile dir the first time the shard runs. An existing shard
+    profile is left as is, so logging into it separately still works
+    """
+    if shard_path == profile_path or os.path.exists(shard_path) or not os.path.isdir(profile_path):
+        return
+
+    try:
+        shutil.copytree(profile_path, shard_path, symlinks=True, ignore=PROFILE_COPY_IGNORE)
+        logger.info(f"Copied Chrome profile {profile_path} to {shard_path}")
+    except OSError as e:
+        # A partial copy would be mistaken for a complete one next time
+        shutil.rmtree(shard_path, ignore_errors=True)
+        logger.warning(f"⚠️ Couldn't copy Chrome profile to {shard_path}, log in there once: {e}")
+
+
+def shard_file_path(path: str, shard: int) -> str:
+    """
+    Returns the `<name>-shard<n><extension>` path of `shard`'s copy of an output file
+    """
+    name, extension = os.path.splitext(path)
+    return f"{name}-shard{shard}{extension}"
+
+
+def run_shard(args: argparse.Namespace) -> None:
+    """
+    Entry point of a shard process, runs a `JobScraper` on its own Chrome instance
+    """
+    from .job_scraper import JobScraper
+
+    logger = setup_logging(os.getenv('LOGGING_PATH'), args.log_level, args.json_log)
+    logger.info(f"Shard {args.shard} Started On {args.cdp_url} With {len(args.searches)} Searches")
+
+    scraper = JobScraper(args, logger)
+    asyncio.run(scraper.run())
+
+
+def run_sharded(args: argparse.Namespace, logger: logging.Logger, profile_path: str) -> None:
+    """
+    Splits the searches of `args` across `args.shards` worker processes, each
+    driving its own Chrome instance on a distinct port and profile dir. All
+    shards write into the same SQLite database, and each one its own
+    performance reports
+    """
+    cdp_url = os.getenv('CDP_URL', 'http://127.0.0.1:9222')
+    context = multiprocessing.get_context('spawn')
+    processes = []
+
+    for shard, searches in enumerate(shard_searches(args.searches, args.shards)):
+        shard_args = argparse.Namespace(**vars(args))
+        shard_args.shard = shard
+        shard_args.searches = searches
+        shard_args.cdp_url = shard_cdp_url(cdp_url, shard)
+        shard_args.chrome_profile_path = shard_profile_path(profile_path, shard)
+        copy_shard_profile(profile_path, shard_args.chrome_profile_path, logger)
+
+        if args.metrics_report:
+            shard_args.metrics_report = shard_file_path(args.metrics_report, shard)
+        if args.prometheus_file:
+            shard_args.prometheus_file = shard_file_path(args.prometheus_file, shard)
+
+        process = context.Process(target=run_shard, args=(shard_args,), name=f"scraper-shard-{shard}")
+        process.start()
+        processes.append(process)
+
+    logger.info(f"Started {len(processes)} Shards")
+
+    for process in processes:
+        process.join()
+
+        if process.exitcode != 0:
+            logger.critical(f"❌ {process.name} exited with code {process.exitcode}")
+        else:
+            logger.info(f"✅ {process.name} finished")
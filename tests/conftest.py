@@ -0,0 +1,15 @@
+import logging
+import pytest
+
+
+@pytest.fixture
+def logger() -> logging.Logger:
+    return logging.getLogger("tests")
+
+
+@pytest.fixture
+def database_path(tmp_path, monkeypatch) -> str:
+    """Points `DatabaseManager` at a throwaway database"""
+    path = str(tmp_path / "jobs.db")
+    monkeypatch.setenv("DATABASE_PATH", path)
+    return path
@@ -0,0 +1,98 @@
+import json
+import asyncio
+import logging
+import os
+from scraper.api_parser import ApiJobCards, get_start, parse_job_cards
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+CARDS_URL = ("https://www.linkedin.com/voyager/api/voyagerJobsDashJobCards?decorationId=com.linkedin.voyager"
+             ".dash.deco.jobs.search.JobSearchCardsCollection-187&count=25&q=jobSearch"
+             "&query=(origin:JOB_SEARCH_PAGE_JOB_FILTER,keywords:python,locationUnion:(geoId:103644278))")
+
+
+def load_fixture(name: str):
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as fixture_file:
+        return json.load(fixture_file)
+
+
+class FakeResponse:
+    """The parts of a Playwright `Response` that `ApiJobCards` reads"""
+
+    def __init__(self, url: str, payload):
+        self.url = url
+        self.ok = True
+        self.payload = payload
+
+    async def json(self):
+        return self.payload
+
+
+def job_card(jobid: str) -> dict:
+    return {
+        "$type": "com.linkedin.voyager.dash.jobs.JobPostingCard",
+        "jobPostingUrn": f"urn:li:fsd_jobPosting:{jobid}",
+        "jobPostingTitle": f"Job {jobid}",
+        "primaryDescription": {"text": "Acme"},
+        "secondaryDescription": {"text": "Miami, FL"},
+    }
+
+
+def test_parse_job_cards_reads_every_urn_variant():
+    records = parse_job_cards(load_fixture("voyager_job_cards.json"))
+
+    assert [record["jobid"] for record in records] == ["4012345678", "4012345679", "4012345680", "4012345681"]
+
+
+def test_parse_job_cards_skips_duplicates_and_cards_without_a_jobid():
+    records = parse_job_cards(load_fixture("voyager_job_cards.json"))
+    jobids = [record["jobid"] for record in records]
+
+    assert len(jobids) == len(set(jobids))
+    assert "Promoted Placeholder" not in [record["title"] for record in records]
+
+
+def test_parse_job_cards_splits_the_remote_status_off_the_location():
+    records = {record["jobid"]: record for record in parse_job_cards(load_fixture("voyager_job_cards.json"))}
+
+    assert records["4012345678"] == {
+        "jobid": "4012345678",
+        "title": "Senior Python Developer",
+        "company": "Acme Robotics",
+        "location": "Miami, FL",
+        "remote_status": "Remote",
+    }
+    assert (records["4012345679"]["location"], records["4012345679"]["remote_status"]) == ("New York, NY", "Hybrid")
+    assert (records["4012345680"]["location"], records["4012345680"]["remote_status"]) == ("United States", "")
+    assert records["4012345681"]["remote_status"] == "On-site"
+
+
+def test_parse_job_cards_falls_back_to_the_title_view_model():
+    records = {record["jobid"]: record for record in parse_job_cards(load_fixture("voyager_job_cards.json"))}
+
+    assert records["4012345679"]["title"] == "Data Engineer"
+    assert records["4012345681"]["title"] == "Backend Engineer (Go)"
+
+
+def test_get_start_reads_the_url_parameter_or_the_query_field():
+    assert get_start(CARDS_URL) == 0
+    assert get_start(CARDS_URL + "&start=50") == 50
+    assert get_start(CARDS_URL.replace("keywords:python", "keywords:python,start:25")) == 25
+
+
+def test_api_job_cards_only_takes_the_cards_of_the_requested_page():
+    async def collect():
+        api_cards = ApiJobCards(logging.getLogger("test"), 25)
+
+        # The second page arrives in two chunks, and a response of the first page arrives late
+        for url, jobids in [(CARDS_URL, ["1", "2"]),
+                            (CARDS_URL + "&start=25", ["26"]),
+                            (CARDS_URL + "&start=32", ["27"]),
+                            (CARDS_URL, ["3"]),
+                            (CARDS_URL + "&start=50", ["51"])]:
+            api_cards.handle_response(FakeResponse(url, {"included": [job_card(jobid) for jobid in jobids]}))
+
+        pages = [await api_cards.take(start) for start in (25, 0, 50)]
+        return [[card["jobid"] for card in cards] for cards in pages]
+
+    assert asyncio.run(collect()) == [["26", "27"], [], ["51"]]
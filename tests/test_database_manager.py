@@ -0,0 +1,45 @@
+import pytest
+from scraper.database_manager import DatabaseManager
+
+JOBS = [
+    ('201', 'Site Reliability Engineer', 'Cloud Works', 'Miami, FL', 'Remote', 'url'),
+    ('202', 'Reliability Site Lead', 'Iron Systems', 'Austin, TX', '', 'url'),
+    ('203', 'Senior Engineer (C++)', 'Zen Labs', 'Miami, FL', 'Hybrid', 'url'),
+    ('204', 'Data Engineering Manager', 'Blue Labs', 'Tampa, FL', '', 'url'),
+]
+
+
+@pytest.mark.parametrize("search_term, fts_query", [
+    ('Python', '"Python"'),
+    ('Data  Engineer', '"Data" "Engineer"'),
+    ('"Site Reliability" Miami', '"Site Reliability" "Miami"'),
+    ('Eng*', '"Eng"*'),
+    ('*', '"*"'),
+    ('C++ AND NOT', '"C++" "AND" "NOT"'),
+    ('title:Dev', '"title:Dev"'),
+    ('say"hi', '"say""hi"'),
+    ('   ', ''),
+])
+def test_build_fts_query(search_term, fts_query):
+    assert DatabaseManager.build_fts_query(search_term) == fts_query
+
+
+@pytest.fixture
+def database_manager(database_path, logger):
+    database_manager = DatabaseManager(logger)
+    database_manager.add_jobs_many(JOBS)
+    yield database_manager
+    database_manager.close()
+
+
+@pytest.mark.parametrize("search_term, jobids", [
+    ('"Site Reliability"', ['201']),
+    ('Site Reliability', ['201', '202']),
+    ('Eng*', ['201', '203', '204']),
+    ('Miami Remote', ['201']),
+    ('C++', ['203']),
+    ('NOT', []),
+    ('', []),
+])
+def test_search_jobs_matches_the_fts_query(database_manager, search_term, jobids):
+    assert sorted(row[1] for row in database_manager.search_jobs(search_term)) == jobids
@@ -0,0 +1,147 @@
+import asyncio
+import sqlite3
+import pytest
+from scraper import database_writer
+from scraper.database_manager import DatabaseManager
+from scraper.database_writer import DatabaseWriter
+from scraper.metrics import Metrics
+
+
+def job(jobid: str) -> tuple:
+    return (jobid, 'Data Engineer', 'Blue Labs', 'Tampa, FL', '', 'url')
+
+
+def count_committed_jobs(database_path: str) -> int:
+    """Counts the jobs on a second connection, which only sees committed rows"""
+    conn = sqlite3.connect(database_path)
+    try:
+        return conn.execute('SELECT COUNT(*) FROM jobs').fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_call_returns_the_result_after_earlier_submits(database_path, logger):
+    async def run():
+        writer = DatabaseWriter(logger)
+        writer.start()
+        try:
+            await writer.submit('add_jobs_many', [job('1')])
+            return await writer.call('filter_new_jobs', ['1', '2'])
+        finally:
+            await writer.close()
+
+    assert asyncio.run(run()) == ['2']
+
+
+def test_call_reraises_the_database_manager_error(database_path, logger, monkeypatch):
+    def fail(self, search_key):
+        raise sqlite3.OperationalError('disk I/O error')
+
+    monkeypatch.setattr(DatabaseManager, 'get_crawl_state', fail)
+
+    async def run():
+        writer = DatabaseWriter(logger)
+        writer.start()
+        try:
+            with pytest.raises(sqlite3.OperationalError, match='disk I/O error'):
+                await writer.call('get_crawl_state', 'python')
+
+            # The writer keeps serving calls after an error
+            return await writer.call('filter_new_jobs', ['1'])
+        finally:
+            await writer.close()
+
+    assert asyncio.run(run()) == ['1']
+
+
+def test_group_commit_by_size(database_path, logger):
+    async def run():
+        writer = DatabaseWriter(logger, group_commit_size=3, group_commit_interval=60)
+        writer.start()
+        try:
+            # The call is the second pending one, and waiting on it means the submit ran too
+            await writer.submit('add_jobs_many', [job('1')])
+            await writer.call('filter_new_jobs', ['1'])
+            before_commit = count_committed_jobs(database_path)
+
+            await writer.submit('add_jobs_many', [job('2')])
+            await writer.call('filter_new_jobs', ['2'])
+            after_commit = count_committed_jobs(database_path)
+        finally:
+            await writer.close()
+
+        return before_commit, after_commit
+
+    assert asyncio.run(run()) == (0, 2)
+
+
+def test_group_commit_by_time(database_path, logger):
+    async def run():
+        writer = DatabaseWriter(logger, group_commit_size=100, group_commit_interval=0.2)
+        writer.start()
+        try:
+            await writer.submit('add_jobs_many', [job('1')])
+            await writer.call('filter_new_jobs', ['1'])
+            before_commit = count_committed_jobs(database_path)
+
+            await asyncio.sleep(0.5)
+            after_commit = count_committed_jobs(database_path)
+        finally:
+            await writer.close()
+
+        return before_commit, after_commit
+
+    assert asyncio.run(run()) == (0, 1)
+
+
+def test_close_commits_the_pending_writes(database_path, logger):
+    async def run():
+        writer = DatabaseWriter(logger, group_commit_size=100, group_commit_interval=60)
+        writer.start()
+        await writer.submit('add_jobs_many', [job('1'), job('2')])
+        await writer.close()
+
+    asyncio.run(run())
+
+    assert count_committed_jobs(database_path) == 2
+
+
+def test_submit_waits_while_the_queue_is_full(database_path, logger, monkeypatch):
+    monkeypatch.setattr(database_writer, 'MAX_QUEUED_CALLS', 2)
+
+    async def run():
+        # The writer thread isn't started yet, so nothing drains the queue
+        writer = DatabaseWriter(logger)
+        await writer.submit('add_jobs_many', [job('1')])
+        await writer.submit('add_jobs_many', [job('2')])
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(writer.submit('add_jobs_many', [job('3')]), 0.1)
+
+        queued = writer.queue.qsize()
+
+        writer.start()
+        await writer.submit('add_jobs_many', [job('3')])
+        await writer.close()
+        return queued
+
+    assert asyncio.run(run()) == 2
+    assert count_committed_jobs(database_path) == 3
+
+
+def test_timings_are_recorded_under_the_search_of_the_call(database_path, logger):
+    metrics = Metrics()
+
+    async def run():
+        writer = DatabaseWriter(logger, metrics=metrics)
+        writer.start()
+        await writer.submit('add_jobs_many', [job('1')], search='python')
+        await writer.call('filter_new_jobs', ['1'], search='golang')
+        await writer.close()
+
+    asyncio.run(run())
+    by_search = metrics.report()['by_search']
+
+    assert 'db_execute_many' in by_search['python']['work']
+    assert 'db_fetch' in by_search['golang']['work']
+    assert 'db_fetch' not in by_search['python']['work']
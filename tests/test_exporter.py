@@ -0,0 +1,79 @@
+import os
+import json
+import pytest
+from scraper.database_manager import DatabaseManager
+
+pytest.importorskip("dotenv")
+
+from scraper.exporter import JobExporter, JsonLinesWriter
+
+
+def job(jobid: str) -> tuple:
+    return (jobid, 'Data Engineer', 'Blue Labs', 'Tampa, FL', '', 'url')
+
+
+def read_jobids(path: str) -> list:
+    with open(path, encoding='utf-8') as output:
+        return [json.loads(line)['jobid'] for line in output]
+
+
+@pytest.fixture
+def database_manager(database_path, logger):
+    database_manager = DatabaseManager(logger)
+    database_manager.add_jobs_many([job('1'), job('2')])
+    yield database_manager
+    database_manager.close()
+
+
+@pytest.fixture
+def exporter(database_manager, logger):
+    return JobExporter(database_manager, logger)
+
+
+def test_since_last_only_exports_the_new_jobs(exporter, database_manager, tmp_path):
+    path = str(tmp_path / 'jobs.jsonl')
+
+    count, last_id = exporter.export(path, since_last='daily')
+    assert count == 2
+    assert read_jobids(path) == ['1', '2']
+    assert database_manager.get_export_watermark('daily') == last_id
+
+    database_manager.add_jobs_many([job('3')])
+    count, last_id = exporter.export(path, since_last='daily')
+
+    assert count == 1
+    assert read_jobids(path) == ['3']
+    assert database_manager.get_export_watermark('daily') == last_id
+
+
+def test_empty_since_last_run_leaves_only_the_header(exporter, database_manager, tmp_path):
+    path = str(tmp_path / 'jobs.csv')
+    exporter.export(path, since_last='daily')
+    watermark = database_manager.get_export_watermark('daily')
+
+    assert exporter.export(path, since_last='daily') == (0, watermark)
+
+    with open(path, encoding='utf-8') as output:
+        lines = output.read().splitlines()
+
+    assert lines == [','.join(database_manager.get_column_types('jobs'))]
+    assert database_manager.get_export_watermark('daily') == watermark
+
+
+def test_failed_write_keeps_the_output_and_watermark(exporter, database_manager, tmp_path, monkeypatch):
+    path = str(tmp_path / 'jobs.jsonl')
+    exporter.export(path, since_last='daily')
+    watermark = database_manager.get_export_watermark('daily')
+    database_manager.add_jobs_many([job('3')])
+
+    def fail(self, rows):
+        raise OSError('No space left on device')
+
+    monkeypatch.setattr(JsonLinesWriter, 'write', fail)
+
+    with pytest.raises(OSError):
+        exporter.export(path, since_last='daily')
+
+    assert read_jobids(path) == ['1', '2']
+    assert database_manager.get_export_watermark('daily') == watermark
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
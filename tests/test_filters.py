@@ -0,0 +1,95 @@
+import pytest
+from scraper import filters
+from scraper.filters import AhoCorasickMatcher, CardFilter, RegexMatcher
+
+BACKENDS = [filters.BACKEND_REGEX, filters.BACKEND_AHO_CORASICK]
+
+FILTER_ENV_VARS = [f'{field.upper()}_{kind}' for field in filters.FILTER_FIELDS
+                   for kind in ('BLOCKLIST', 'ALLOWLIST')] + ['TERMS_BLOCKLIST']
+
+
+def card(**fields) -> dict:
+    return {"jobid": "1", "title": "", "company": "", "location": "", "remote_status": "", **fields}
+
+
+@pytest.fixture(autouse=True)
+def clear_filter_env(monkeypatch):
+    for name in FILTER_ENV_VARS:
+        monkeypatch.delenv(name, raising=False)
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    if request.param == filters.BACKEND_AHO_CORASICK and filters.ahocorasick is None:
+        pytest.skip("pyahocorasick isn't installed")
+    return request.param
+
+
+def test_no_rules_pass_every_card(logger):
+    assert CardFilter(logger).check(card(title="Senior Engineer")) is None
+
+
+def test_title_blocklist_includes_terms_blocklist(monkeypatch, logger, backend):
+    monkeypatch.setenv('TERMS_BLOCKLIST', 'Senior, Staff')
+    monkeypatch.setenv('TITLE_BLOCKLIST', 'Principal')
+    card_filter = CardFilter(logger, backend)
+
+    assert card_filter.check(card(title="Senior Engineer")) == "title contains blocked term 'Senior'"
+    assert card_filter.check(card(title="Principal Engineer")) == "title contains blocked term 'Principal'"
+    assert card_filter.check(card(title="Software Engineer")) is None
+
+
+def test_allowlist_needs_one_of_its_terms(monkeypatch, logger, backend):
+    monkeypatch.setenv('REMOTE_STATUS_ALLOWLIST', 'Remote,Hybrid')
+    card_filter = CardFilter(logger, backend)
+
+    assert card_filter.check(card(remote_status="Hybrid")) is None
+    assert card_filter.check(card(remote_status="On-site")) == "remote_status 'On-site' isn't allowed"
+
+
+def test_empty_fields_are_left_for_the_complete_check(monkeypatch, logger, backend):
+    monkeypatch.setenv('COMPANY_ALLOWLIST', 'Acme')
+    monkeypatch.setenv('TITLE_BLOCKLIST', 'Senior')
+    card_filter = CardFilter(logger, backend)
+
+    # A card that hasn't rendered yet can still be blocked by the fields it shows
+    assert card_filter.check(card(), complete=False) is None
+    assert card_filter.check(card(title="Senior Dev"), complete=False) == "title contains blocked term 'Senior'"
+    assert card_filter.check(card(title="Dev")) == "company '' isn't allowed"
+    assert card_filter.check(card(title="Dev", company="Acme Corp")) is None
+
+
+def test_case_is_matched_unless_ignored(monkeypatch, logger, backend):
+    monkeypatch.setenv('TITLE_BLOCKLIST', 'senior')
+
+    assert CardFilter(logger, backend).check(card(title="Senior Dev")) is None
+    assert CardFilter(logger, backend, ignore_case=True).check(card(title="SENIOR Dev")) is not None
+
+
+def test_word_boundaries(monkeypatch, logger, backend):
+    monkeypatch.setenv('TITLE_BLOCKLIST', 'Java,C++,Sr.')
+    card_filter = CardFilter(logger, backend, word_boundaries=True)
+
+    assert card_filter.check(card(title="JavaScript Developer")) is None
+    assert card_filter.check(card(title="Java Developer")) is not None
+    assert card_filter.check(card(title="C++ Engineer")) is not None
+    assert card_filter.check(card(title="Sr. Engineer")) is not None
+    assert CardFilter(logger, backend).check(card(title="JavaScript Developer")) is not None
+
+
+def test_missing_aho_corasick_falls_back_to_regex(monkeypatch, logger):
+    monkeypatch.setattr(filters, 'ahocorasick', None)
+    monkeypatch.setenv('TITLE_BLOCKLIST', 'Senior')
+    card_filter = CardFilter(logger, filters.BACKEND_AHO_CORASICK)
+
+    assert isinstance(card_filter.rules[0][2], RegexMatcher)
+    assert card_filter.check(card(title="Senior Dev")) is not None
+
+
+@pytest.mark.parametrize("matcher_class", [RegexMatcher, AhoCorasickMatcher])
+def test_matchers_prefer_the_longest_overlapping_term(matcher_class):
+    if matcher_class is AhoCorasickMatcher and filters.ahocorasick is None:
+        pytest.skip("pyahocorasick isn't installed")
+
+    assert matcher_class(['Engineer', 'Engineering Manager'], word_boundaries=True).search(
+        'Engineering Manager') == 'Engineering Manager'
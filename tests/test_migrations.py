@@ -0,0 +1,156 @@
+import sqlite3
+import pytest
+from scraper.database_manager import DatabaseManager
+from scraper.migrations import SCHEMA_VERSION, get_schema_version, migrate
+
+# The schema databases were created with before migrations existed
+BASELINE_SCHEMA = '''
+    CREATE TABLE jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        jobid TEXT UNIQUE,
+        title TEXT,
+        company TEXT,
+        location TEXT,
+        remote_status TEXT,
+        linkedin_url TEXT
+    );
+    CREATE TABLE employers (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        company TEXT UNIQUE,
+        state TEXT
+    );
+'''
+
+# The schema right before migrations, with the full-text index updated on every `jobs` update
+INTERMEDIATE_SCHEMA = BASELINE_SCHEMA + '''
+    ALTER TABLE jobs ADD COLUMN description TEXT;
+    ALTER TABLE jobs ADD COLUMN seniority_level TEXT;
+    ALTER TABLE jobs ADD COLUMN applicant_count INTEGER;
+    ALTER TABLE jobs ADD COLUMN details_scraped_at TEXT;
+    CREATE TABLE crawl_state (
+        search_key TEXT PRIMARY KEY,
+        last_page INTEGER NOT NULL DEFAULT 0,
+        cursor TEXT,
+        status TEXT NOT NULL,
+        updated_at TEXT NOT NULL
+    );
+    CREATE TABLE search_runs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        search_key TEXT NOT NULL,
+        started_at TEXT NOT NULL,
+        finished_at TEXT NOT NULL,
+        pages INTEGER NOT NULL,
+        cards INTEGER NOT NULL,
+        new_jobs INTEGER NOT NULL,
+        stop_reason TEXT NOT NULL
+    );
+    CREATE VIRTUAL TABLE jobs_fts USING fts5(
+        title, company, location, remote_status,
+        content='jobs', content_rowid='id'
+    );
+    CREATE TRIGGER jobs_fts_insert AFTER INSERT ON jobs BEGIN
+        INSERT INTO jobs_fts (rowid, title, company, location, remote_status)
+        VALUES (new.id, new.title, new.company, new.location, new.remote_status);
+    END;
+    CREATE TRIGGER jobs_fts_update AFTER UPDATE ON jobs BEGIN
+        INSERT INTO jobs_fts (jobs_fts, rowid, title, company, location, remote_status)
+        VALUES ('delete', old.id, old.title, old.company, old.location, old.remote_status);
+        INSERT INTO jobs_fts (rowid, title, company, location, remote_status)
+        VALUES (new.id, new.title, new.company, new.location, new.remote_status);
+    END;
+'''
+
+JOBS = [
+    ('101', 'Python Developer', 'Acme', 'Miami, FL', 'Remote', 'https://www.linkedin.com/jobs/view/101'),
+    ('102', 'Data Engineer', 'Blue Labs', 'Tampa, FL', '', 'https://www.linkedin.com/jobs/view/102'),
+]
+
+
+def create_database(path: str, schema: str) -> None:
+    conn = sqlite3.connect(path)
+    conn.executescript(schema)
+    conn.executemany('''
+        INSERT INTO jobs (jobid, title, company, location, remote_status, linkedin_url) VALUES (?, ?, ?, ?, ?, ?)
+    ''', JOBS)
+    conn.execute("INSERT INTO employers (company, state) VALUES ('Acme', 'Florida')")
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture(params=[BASELINE_SCHEMA, INTERMEDIATE_SCHEMA], ids=["baseline", "intermediate"])
+def upgraded_database(request, database_path, logger):
+    create_database(database_path, request.param)
+    database_manager = DatabaseManager(logger)
+    yield database_manager
+    database_manager.close()
+
+
+def test_new_database_is_created_at_the_latest_version(database_path, logger):
+    database_manager = DatabaseManager(logger)
+
+    assert database_manager.schema_version == SCHEMA_VERSION
+    assert get_schema_version(database_manager.cursor) == SCHEMA_VERSION
+    database_manager.close()
+
+
+def test_migrate_is_a_no_op_once_up_to_date(database_path, logger):
+    DatabaseManager(logger).close()
+    conn = sqlite3.connect(database_path)
+
+    assert migrate(conn, logger) == SCHEMA_VERSION
+    conn.close()
+
+
+def test_existing_database_reaches_the_latest_version(upgraded_database):
+    assert upgraded_database.schema_version == SCHEMA_VERSION
+    assert upgraded_database.get_column_types('export_watermarks')
+    assert upgraded_database._fetch_query('SELECT COUNT(*) FROM jobs')[0][0] == len(JOBS)
+
+
+def test_existing_jobs_are_linked_to_their_employers(upgraded_database):
+    rows = dict(upgraded_database._fetch_query('''
+        SELECT jobs.jobid, employers.company FROM jobs JOIN employers ON employers.id = jobs.company_id
+    '''))
+
+    # Employers missing from the table are added for the jobs that reference them
+    assert rows == {'101': 'Acme', '102': 'Blue Labs'}
+
+
+def test_existing_jobs_get_first_and_last_seen(upgraded_database):
+    rows = upgraded_database._fetch_query('SELECT first_seen, last_seen FROM jobs')
+
+    assert all(first_seen and last_seen == first_seen for first_seen, last_seen in rows)
+
+
+def test_search_index_only_updates_on_searchable_columns(upgraded_database):
+    triggers = dict(upgraded_database._fetch_query(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND name = 'jobs_fts_update'"
+    ))
+
+    assert 'UPDATE OF title, company, location, remote_status' in triggers['jobs_fts_update']
+
+
+def test_search_index_stays_in_sync_after_an_upsert(upgraded_database):
+    upgraded_database.add_jobs_many([JOBS[0], ('103', 'Go Developer', 'Acme', 'Miami, FL', '', 'url')])
+    upgraded_database.update_job_details('102', 'Pipelines', 'Mid-Senior level', 12)
+    upgraded_database.cursor.execute("UPDATE jobs SET title = 'Rust Developer' WHERE jobid = '101'")
+    upgraded_database.commit()
+
+    # Raises if the index and the `jobs` table disagree
+    upgraded_database.cursor.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('integrity-check')")
+
+    assert sorted(row[1] for row in upgraded_database.search_jobs('Developer')) == ['101', '103']
+    assert upgraded_database.search_jobs('Python') == []
+    assert [row[1] for row in upgraded_database.search_jobs('Data Engineer')] == ['102']
+
+
+def test_upsert_keeps_the_job_and_moves_last_seen(upgraded_database):
+    upgraded_database.add_jobs_many([JOBS[0]])
+    upgraded_database.add_jobs_many([JOBS[0][:1] + ('Changed Title',) + JOBS[0][2:]])
+
+    (title, first_seen, last_seen), = upgraded_database._fetch_query(
+        "SELECT title, first_seen, last_seen FROM jobs WHERE jobid = '101'"
+    )
+    assert title == 'Python Developer'
+    assert last_seen > first_seen
+    assert upgraded_database._fetch_query('SELECT COUNT(*) FROM jobs')[0][0] == len(JOBS)